@@ -3,12 +3,18 @@
 import os, pickle
 import autograd.numpy as np  # Thinly-wrapped version of Numpy
 import math
-import pandas as pd
 from functools import partial
 
 from seldonian.models import objectives
 from seldonian.dataset import SupervisedDataSet, RLDataSet
 
+# Lazy module-level handles for the black-box optimizers.
+# Imported on first use and reused across run() calls so that
+# repeated runs (e.g. hyperparameter sweeps) do not pay the
+# import machinery each time
+_minimize = None
+_cma = None
+
 
 class CandidateSelection(object):
     def __init__(
@@ -74,7 +80,16 @@ class CandidateSelection(object):
         if self.regime == "supervised_learning":
             self.features = self.candidate_dataset.features
             self.labels = self.candidate_dataset.labels
-
+            # Make sure the arrays used inside the optimizer's
+            # inner loop are contiguous ndarrays so that each
+            # iteration gets fast C-ordered views instead of
+            # paying conversion costs per objective evaluation.
+            # Features can also be a list of arrays, in which case
+            # we leave them alone.
+            if isinstance(self.features, np.ndarray):
+                self.features = np.ascontiguousarray(self.features)
+            if isinstance(self.labels, np.ndarray):
+                self.labels = np.ascontiguousarray(self.labels)
         self.parse_trees = parse_trees
         self.primary_objective = (
             primary_objective  # must accept theta, features, labels
@@ -84,6 +99,15 @@ class CandidateSelection(object):
         self.initial_solution = initial_solution
         self.candidate_solution = None
         self.write_logfile = write_logfile
+        # Cache of constraint upper bounds keyed on theta,
+        # used to avoid re-propagating the parse trees when the
+        # black-box optimizers re-evaluate a solution they have
+        # already seen. Only used in the barrier_function technique,
+        # where the dataset is fixed for the whole optimization.
+        self._upper_bounds_cache = {}
+        # Favorite solution from a previous CMA-ES run, used to
+        # warm-start subsequent run() calls on this instance
+        self._cmaes_warm_start = None
 
         if "reg_coef" in kwargs:
             self.reg_coef = kwargs["reg_coef"]
@@ -164,8 +188,23 @@ class CandidateSelection(object):
         :return: Optimized model weights or 'NSF'
         :rtype: array or str
         """
+        # Optionally run the optimization in single precision.
+        # This halves the memory traffic of the matrix products
+        # in the objective, which dominates on wider datasets.
+        # Off by default since it changes results at the ~1e-7
+        # level. Passed in the optimization_hyperparams dictionary
+        # of the spec, like the other keys read from kwargs here
+        if kwargs.get("precision", "float64") == "float32":
+            if self.regime == "supervised_learning":
+                if isinstance(self.features, np.ndarray):
+                    self.features = self.features.astype(np.float32)
+                if isinstance(self.labels, np.ndarray):
+                    self.labels = self.labels.astype(np.float32)
+            if isinstance(self.initial_solution, np.ndarray):
+                self.initial_solution = self.initial_solution.astype(np.float32)
+
         if self.optimization_technique == "gradient_descent":
-            if self.optimizer != "adam":
+            if self.optimizer not in ["adam", "nadam"]:
                 raise NotImplementedError(
                     f"Optimizer: {self.optimizer} is not supported"
                 )
@@ -207,9 +246,12 @@ class CandidateSelection(object):
                 alpha_lamb=kwargs["alpha_lamb"],
                 beta_velocity=kwargs["beta_velocity"],
                 beta_rmsprop=kwargs["beta_rmsprop"],
+                amsgrad=kwargs.get("amsgrad", False),
+                nesterov=(self.optimizer == "nadam"),
                 theta_init=self.initial_solution,
                 lambda_init=kwargs["lambda_init"],
                 verbose=kwargs["verbose"],
+                verbose_every=kwargs.get("verbose_every", 50),
                 debug=kwargs["debug"],
             )
             # Option to use builtin primary gradient (could be faster than autograd)
@@ -301,9 +343,11 @@ class CandidateSelection(object):
                 opts["maxiter"] = kwargs["maxiter"]
 
             if self.optimizer in ["Powell", "CG", "Nelder-Mead", "BFGS"]:
-                from scipy.optimize import minimize
+                global _minimize
+                if _minimize is None:
+                    from scipy.optimize import minimize as _minimize
 
-                res = minimize(
+                res = _minimize(
                     self.objective_with_barrier,
                     x0=self.initial_solution,
                     method=self.optimizer,
@@ -315,15 +359,27 @@ class CandidateSelection(object):
                 self.optimization_result = res
 
             elif self.optimizer == "CMA-ES":
-                import cma
+                global _cma
+                if _cma is None:
+                    import cma as _cma
 
                 if "seed" in kwargs:
                     opts["seed"] = kwargs["seed"]
 
-                es = cma.CMAEvolutionStrategy(self.initial_solution, 0.2, opts)
+                # Warm-start from the favorite solution of a previous
+                # run() on this instance, if there was one. Repeated
+                # runs (e.g. hyperparameter sweeps) then resume near
+                # the prior optimum instead of restarting from scratch
+                if self._cmaes_warm_start is not None:
+                    x0 = self._cmaes_warm_start
+                else:
+                    x0 = self.initial_solution
+
+                es = _cma.CMAEvolutionStrategy(x0, 0.2, opts)
 
                 es.optimize(self.objective_with_barrier)
                 candidate_solution = es.result.xbest
+                self._cmaes_warm_start = es.result.xfavorite
                 self.optimization_result = es.result
             else:
                 raise NotImplementedError(
@@ -335,7 +391,9 @@ class CandidateSelection(object):
             )
 
         # Reset parse tree base node dicts,
-        # including data and datasize attributes
+        # including data and datasize attributes,
+        # and drop the cached upper bounds
+        self._upper_bounds_cache = {}
         for pt in self.parse_trees:
             pt.reset_base_node_dict(reset_data=True)
 
@@ -343,6 +401,33 @@ class CandidateSelection(object):
         # Return the candidate solution we believe will pass the safety test
         return candidate_solution
 
+    def _share_base_node_data(self):
+        """Share prepared base-node data across parse trees.
+        Constraints frequently reference the same predicate
+        (e.g. 'PR | [M]' appears in both halves of an equalized
+        odds constraint pair). The prepared data for a base node
+        depends only on the dataset, not on theta, so any tree
+        that has already prepared data for a given base node name
+        can lend it to the other trees instead of each tree
+        re-masking the dataset.
+
+        :return: None
+        """
+        if len(self.parse_trees) < 2:
+            return
+
+        shared_data_dicts = {}
+        for pt in self.parse_trees:
+            for node_name, entry in pt.base_node_dict.items():
+                if entry["data_dict"] is not None:
+                    shared_data_dicts.setdefault(node_name, entry["data_dict"])
+
+        if shared_data_dicts:
+            for pt in self.parse_trees:
+                for node_name, entry in pt.base_node_dict.items():
+                    if entry["data_dict"] is None and node_name in shared_data_dicts:
+                        entry["data_dict"] = shared_data_dicts[node_name]
+
     def objective_with_barrier(self, theta):
         """The objective function to be optimized if
         minimization_technique == 'barrier'. Adds in a
@@ -376,46 +461,58 @@ class CandidateSelection(object):
             result += reg_term
 
         # Prediction of what the safety test will return.
-        # Initialized to pass
-        predictSafetyTest = True
-        for tree_i, pt in enumerate(self.parse_trees):
-            # before we propagate, reset the bounds on all base nodes
-            pt.reset_base_node_dict()
-
-            bounds_kwargs = dict(
-                theta=theta,
-                dataset=self.candidate_dataset,
-                model=self.model,
-                branch="candidate_selection",
-                n_safety=self.n_safety,
-                regime=self.regime,
-            )
-
-            pt.propagate_bounds(**bounds_kwargs)
+        # Propagate the bounds on each tree, then apply the barrier
+        # and shaping terms in one vectorized pass over the
+        # constraint upper bounds. If this theta was already
+        # evaluated, reuse the cached upper bounds instead of
+        # re-propagating the trees.
+        theta_key = theta.tobytes() if type(theta) is np.ndarray else None
+        if theta_key is not None and theta_key in self._upper_bounds_cache:
+            upper_bounds = self._upper_bounds_cache[theta_key]
+        else:
+            self._share_base_node_data()
+            upper_bounds = []
+            for pt in self.parse_trees:
+                # before we propagate, reset the bounds on all base nodes
+                pt.reset_base_node_dict()
+
+                bounds_kwargs = dict(
+                    theta=theta,
+                    dataset=self.candidate_dataset,
+                    model=self.model,
+                    branch="candidate_selection",
+                    n_safety=self.n_safety,
+                    regime=self.regime,
+                )
 
-            # Check if the i-th behavioral constraint is satisfied
-            upper_bound = pt.root.upper
-
-            if (
-                upper_bound > 0.0
-            ):  # If the current constraint was not satisfied, the safety test failed
-                # If up until now all previous constraints passed,
-                # then we need to predict that the test will fail
-                # and potentially add a penalty to the objective
-                if predictSafetyTest:
-                    # Set this flag to indicate that we don't think the safety test will pass
-                    predictSafetyTest = False
-
-                    # Put a barrier in the objective. Any solution
-                    # that we think will fail the safety test
-                    # will have a large cost associated with it
-                    if self.optimization_technique == "barrier_function":
-                        result = 100000.0
-                # Add a shaping to the objective function that will
-                # push the search toward solutions that will pass
-                # the prediction of the safety test
-
-                result = result + upper_bound
+                pt.propagate_bounds(**bounds_kwargs)
+                upper_bounds.append(pt.root.upper)
+                # Once any constraint is violated, the barrier value
+                # dominates the objective, so there is no need to pay
+                # for propagating the remaining trees over the
+                # candidate dataset at this theta
+                if (
+                    self.optimization_technique == "barrier_function"
+                    and pt.root.upper > 0.0
+                ):
+                    break
+            upper_bounds = np.array(upper_bounds, dtype="float")
+            if theta_key is not None:
+                self._upper_bounds_cache[theta_key] = upper_bounds
+
+        # Any positive upper bound means we predict that
+        # the safety test will fail
+        violated_upper_bounds = upper_bounds[upper_bounds > 0.0]
+        if violated_upper_bounds.size > 0:
+            # Put a barrier in the objective. Any solution
+            # that we think will fail the safety test
+            # will have a large cost associated with it
+            if self.optimization_technique == "barrier_function":
+                result = 100000.0
+            # Add a shaping to the objective function that will
+            # push the search toward solutions that will pass
+            # the prediction of the safety test
+            result = result + violated_upper_bounds.sum()
 
         return result
 
@@ -467,6 +564,7 @@ class CandidateSelection(object):
         :rtype: array
         """
 
+        self._share_base_node_data()
         upper_bounds = []
 
         for pt in self.parse_trees:
@@ -32,14 +32,30 @@ class DataSetLoader:
         meta = load_supervised_metadata(metadata_filename)
 
         if file_type.lower() == "csv":
-            df = pd.read_csv(filename, header=None, names=meta.all_col_names)
+            try:
+                # pandas' pyarrow engine is a multi-threaded native
+                # CSV reader, considerably faster on large files.
+                # pyarrow is optional, so fall back to the default
+                # parser if it is not installed
+                df = pd.read_csv(
+                    filename, header=None, names=meta.all_col_names, engine="pyarrow"
+                )
+            except ImportError:
+                df = pd.read_csv(filename, header=None, names=meta.all_col_names)
             # separate out features, labels, and sensitive attrs
             features = df.loc[:, meta.feature_col_names].values
             labels = np.squeeze(
                 df.loc[:, meta.label_col_names].values
             )  # converts shape from (N,1) -> (N,) if only a single label column.
             if meta.sensitive_col_names != []:
-                sensitive_attrs = df.loc[:, meta.sensitive_col_names].values
+                # Sensitive attributes are one-hot binary columns, so
+                # store them as a compact integer block rather than
+                # whatever dtype the dataframe produced (float64, or
+                # object on mixed frames, where every == comparison
+                # falls back to Python-level dispatch)
+                sensitive_attrs = df.loc[:, meta.sensitive_col_names].to_numpy(
+                    dtype="int8"
+                )
             else:
                 sensitive_attrs = []
             num_datapoints = len(df)
@@ -86,20 +102,31 @@ class DataSetLoader:
                     f"required number of columns: {n_min_required_cols} "
                     "and the extra column names do not follow the 'R_alt_1','R_alt_2', ... pattern. "
                     "Update the names of these columns, which represent the optional alternate rewards.")
-        for episode_index in df.episode_index.unique():
-            df_ep = df.loc[df.episode_index == episode_index]
-            if has_alt_rewards:
-                alt_reward_names = [f"R_alt_{ii}" for ii in range(1,n_alt_rewards+1)]
-                alt_rewards = df.loc[:,alt_reward_names].values
-            else:
-                alt_rewards = []
-
+        # Rows belonging to the same episode are contiguous, so the
+        # episode boundaries are exactly where consecutive
+        # episode_index values differ. Finding them with one linear
+        # pass and slicing with np.split avoids filtering the whole
+        # dataframe once per episode
+        ep_idx = df.episode_index.values
+        split_indices = np.flatnonzero(ep_idx[1:] != ep_idx[:-1]) + 1
+        observations_by_episode = np.split(df.O.values, split_indices)
+        actions_by_episode = np.split(df.A.values, split_indices)
+        rewards_by_episode = np.split(df.R.values, split_indices)
+        action_probs_by_episode = np.split(df.pi_b.values, split_indices)
+        if has_alt_rewards:
+            alt_reward_names = [f"R_alt_{ii}" for ii in range(1,n_alt_rewards+1)]
+            alt_rewards_by_episode = np.split(
+                df.loc[:, alt_reward_names].values, split_indices
+            )
+        else:
+            alt_rewards_by_episode = [[] for _ in observations_by_episode]
+        for ii in range(len(observations_by_episode)):
             episode = Episode(
-                observations=df_ep.O.values,
-                actions=df_ep.A.values,
-                rewards=df_ep.R.values,
-                action_probs=df_ep.pi_b.values,
-                alt_rewards=alt_rewards
+                observations=observations_by_episode[ii],
+                actions=actions_by_episode[ii],
+                rewards=rewards_by_episode[ii],
+                action_probs=action_probs_by_episode[ii],
+                alt_rewards=alt_rewards_by_episode[ii]
             )
             episodes.append(episode)
         if meta.sensitive_col_names != []:
@@ -140,17 +167,32 @@ class DataSet(object):
 
 class SupervisedDataSet(DataSet):
     def __init__(
-        self, features, labels, sensitive_attrs, num_datapoints, meta
+        self, features, labels, sensitive_attrs, num_datapoints, meta, dtype=None
     ):
+        """Object for holding features, labels, sensitive attributes
+        and metadata for supervised learning
+
+        :param dtype: Optional dtype to cast features and labels to,
+                e.g. np.float32. For ttest-bounded problems the
+                confidence bounds are dominated by sampling error well
+                above float32 precision, so storing the data in
+                float32 halves the memory bandwidth of every pass over
+                the dataset. Leave as None (the default) to keep the
+                arrays as loaded
+        :type dtype: numpy dtype, defaults to None
+        """
         super().__init__(
             num_datapoints=num_datapoints,
             meta=meta,
             regime="supervised_learning",
         )
 
-        self.features = features
-
         assert isinstance(labels, np.ndarray), "labels must be a numpy array"
+        if dtype is not None:
+            if isinstance(features, np.ndarray):
+                features = features.astype(dtype)
+            labels = labels.astype(dtype)
+        self.features = features
         self.labels = labels
 
         self.sensitive_attrs = sensitive_attrs
@@ -4,8 +4,30 @@ import autograd.numpy as np  # Thinly-wrapped version of Numpy
 import math
 
 from seldonian.utils.stats_utils import (weighted_sum_gamma,
-    custom_cumprod, stability_const)
-from seldonian.models.models import BaseLogisticRegressionModel
+    batch_weighted_sum_gamma, custom_cumprod, stability_const)
+from seldonian.models.models import (
+    BaseLogisticRegressionModel,
+    BinaryLogisticRegressionModel,
+)
+
+def _with_intercept(X):
+    """Prepend a column of ones to the feature matrix using a single
+    preallocated buffer, rather than allocating the ones vector and
+    then copying everything again inside np.hstack. Used by the
+    analytical gradient functions
+
+    :param X: The features
+    :type X: numpy ndarray
+
+    :return: features with a leading column of ones
+    :rtype: numpy ndarray
+    """
+    X = np.asarray(X)
+    X_withintercept = np.empty((X.shape[0], X.shape[1] + 1), dtype="float")
+    X_withintercept[:, 0] = 1.0
+    X_withintercept[:, 1:] = X
+    return X_withintercept
+
 
 """ Regression """
 
@@ -54,7 +76,7 @@ def gradient_Mean_Squared_Error(model, theta, X, Y, **kwargs):
     n = len(Y)
     prediction = model.predict(theta, X)  # vector of values
     err = prediction - Y
-    X_withintercept = np.hstack([np.ones((n, 1)), np.array(X)])
+    X_withintercept = _with_intercept(X)
     return 2 / n * np.dot(err, X_withintercept)
 
 
@@ -133,6 +155,16 @@ def binary_logistic_loss(model, theta, X, Y, **kwargs):
     :return: mean logistic loss
     :rtype: float
     """
+    if isinstance(model, BinaryLogisticRegressionModel) and isinstance(X, np.ndarray):
+        # For logistic regression we can compute the loss from the
+        # logits directly: mean(logaddexp(0, -y_pm * z)) with
+        # y_pm in {-1,+1}. A single matrix-vector product produces z,
+        # and logaddexp never overflows for large |z|, so no
+        # stability constant is needed on this path
+        Z = theta[0] + (X @ theta[1:])
+        res = np.mean(np.logaddexp(0.0, -(2.0 * Y - 1.0) * Z))
+        return res
+
     Y_pred = model.predict(theta, X)
     # Add stability constant. This guards against
     # predictions that are 0 or 1, which cause log(Y_pred) or
@@ -165,7 +197,7 @@ def gradient_binary_logistic_loss(model, theta, X, Y, **kwargs):
     assert isinstance(model,BaseLogisticRegressionModel)
 
     h = model.predict(theta, X)
-    X_withintercept = np.hstack([np.ones((len(X), 1)), np.array(X)])
+    X_withintercept = _with_intercept(X)
     res = (1 / len(X)) * np.dot(X_withintercept.T, (h - Y))
     return res
 
@@ -197,6 +229,34 @@ def multiclass_logistic_loss(model, theta, X, Y, **kwargs):
     return -1 / N * sum(np.log(probs_trueclasses))
 
 
+def gradient_multiclass_logistic_loss(model, theta, X, Y, **kwargs):
+    """Analytical gradient of multi-class logistic loss w.r.t. theta.
+    This is only appropriate for softmax (multi-class logistic
+    regression) models. Avoids tracing the loss with autograd.
+
+    :param model: SeldonianModel instance
+    :param theta: The parameter weights
+    :type theta: numpy ndarray
+    :param X: The features
+    :type X: numpy ndarray
+    :param Y: The labels
+    :type Y: numpy ndarray
+
+    :return: d(log loss)/dtheta
+    :rtype: numpy ndarray of shape (j,k)
+    """
+    assert isinstance(model,BaseLogisticRegressionModel)
+
+    # Y_pred is an i x k matrix of class probabilities
+    Y_pred = model.predict(theta, X)
+    N = len(Y)
+    Y_onehot = np.zeros_like(Y_pred)
+    Y_onehot[np.arange(N), Y.astype("int")] = 1.0
+    X_withintercept = _with_intercept(X)
+    res = (1 / N) * np.dot(X_withintercept.T, (Y_pred - Y_onehot))
+    return res
+
+
 def Positive_Rate(model, theta, X, Y, **kwargs):
     """
     Calculate mean positive rate
@@ -740,10 +800,12 @@ def IS_estimate(model, theta, episodes, **kwargs):
         gamma = model.env_kwargs["gamma"]
     else:
         gamma = 1.0
-    # Calculate the expected returns of the primary reward under the behavior policy 
-    weighted_returns = [
-        weighted_sum_gamma(ep.rewards, gamma=gamma) for ep in episodes
-    ]
+    # Calculate the expected returns of the primary reward under the behavior policy.
+    # The returns do not depend on theta, so they can be computed in a
+    # single batched matrix-vector product
+    weighted_returns = batch_weighted_sum_gamma(
+        [ep.rewards for ep in episodes], gamma=gamma
+    )
 
     IS_estimate = 0
     for ii, ep in enumerate(episodes):
@@ -772,9 +834,13 @@ def PDIS_estimate(model, theta, episodes, **kwargs)->float:
     """
 
     gamma = model.env_kwargs["gamma"] if "gamma" in model.env_kwargs else 1.0
+    # The discounted rewards do not depend on theta, so compute the
+    # geometric weights once for the longest episode and slice,
+    # instead of re-evaluating np.power for every episode
+    max_horizon = max(len(ep.rewards) for ep in episodes)
+    discount = np.power(gamma, range(max_horizon))
     PDIS_est = 0.
     for ep in episodes:
-        discount = np.power(gamma, range(len(ep.rewards)))
         pi_news = model.get_probs_from_observations_and_actions(
             theta, ep.observations, ep.actions, ep.action_probs
         )
@@ -783,7 +849,9 @@ def PDIS_estimate(model, theta, episodes, **kwargs)->float:
         # autograd doesn't support np.cumprod
         pi_ratio_prods = custom_cumprod(pi_ratios)
 
-        PDIS_est += np.sum(pi_ratio_prods * discount * ep.rewards)
+        PDIS_est += np.sum(
+            pi_ratio_prods * discount[: len(ep.rewards)] * ep.rewards
+        )
 
     PDIS_est /= len(episodes)
 
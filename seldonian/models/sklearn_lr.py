@@ -26,6 +26,11 @@ class SkLearnLinearRegressor(SupervisedSkLearnBaseModel):
         keeping in mind that there is a y-intercept term (hence the j+1 not j)
         in the predict function
         """
-        m = len(X)
-        X_withintercept = np.hstack([np.ones((m, 1)), np.array(X)])
+        # Build the intercept-augmented matrix in one preallocated
+        # buffer instead of allocating a ones column and copying
+        # everything again inside np.hstack
+        X = np.asarray(X)
+        X_withintercept = np.empty((X.shape[0], X.shape[1] + 1), dtype="float")
+        X_withintercept[:, 0] = 1.0
+        X_withintercept[:, 1:] = X
         return X_withintercept
@@ -1,6 +1,6 @@
 import copy
 import autograd.numpy as np  # Thinly-wrapped version of Numpy
-from autograd import grad, jacobian, elementwise_grad as egrad
+from autograd import grad, jacobian, value_and_grad, elementwise_grad as egrad
 
 import warnings
 from seldonian.warnings.custom_warnings import *
@@ -42,8 +42,11 @@ def gradient_descent_adam(
     alpha_lamb=0.05,
     beta_velocity=0.9,
     beta_rmsprop=0.9,
+    amsgrad=False,
+    nesterov=False,
     gradient_library="autograd",
     verbose=False,
+    verbose_every=50,
     debug=False,
     **kwargs,
 ):
@@ -78,12 +81,26 @@ def gradient_descent_adam(
     :type beta_velocity: float
     :param beta_rmsprop: Exponential decay rate for rmsprop term
     :type beta_rmsprop: float
+    :param amsgrad: If True, use the AMSGrad variant of Adam, which
+        divides by the running maximum of the rmsprop term instead of
+        its current value. This keeps the effective step sizes
+        monotone, which can help convergence on non-convex objectives
+    :type amsgrad: bool, defaults to False
+    :param nesterov: If True, use the Nesterov-accelerated variant of
+        Adam (Nadam), which applies a momentum lookahead in the weight
+        update. Typically reaches a given accuracy in fewer iterations
+        than plain Adam
+    :type nesterov: bool, defaults to False
     :param num_iters: The number of iterations of gradient descent to run
     :type num_iters: int
     :param gradient_library: The name of the library to use for computing
         automatic gradients.
     :type gradient_library: str, defaults to "autograd"
     :param verbose: Boolean flag to control verbosity
+    :param verbose_every: How many iterations between progress prints
+        when verbose=True. stdout I/O inside the inner loop is
+        expensive, so keep this large for long runs
+    :type verbose_every: int, defaults to 50
     :param debug: Boolean flag to print out info useful for debugging
 
     :return: solution, a dictionary containing the solution and metadata
@@ -106,9 +123,15 @@ def gradient_descent_adam(
             f"but shape is {lamb.shape}"
         )
 
-    # initialize Adam parameters
-    velocity_theta, velocity_lamb = 0.0, 0.0
-    s_theta, s_lamb = 0.0, 0.0
+    # initialize Adam parameters.
+    # The velocity and rmsprop accumulators are preallocated
+    # with theta's shape so the per-iteration updates can be
+    # done in place without creating new arrays each step
+    velocity_theta, velocity_lamb = np.zeros_like(theta, dtype="float"), 0.0
+    s_theta, s_lamb = np.zeros_like(theta, dtype="float"), 0.0
+    if amsgrad:
+        # Running maximum of the (bias-corrected) rmsprop term
+        s_theta_max = np.zeros_like(theta, dtype="float")
     rms_offset = 1e-6  # small offset to make sure we don't take 1/sqrt(very small) in weight update
 
     # Initialize params for tracking best solution
@@ -134,8 +157,15 @@ def gradient_descent_adam(
     # It is possible that the user provided the function df/dtheta,
     # which can often speed up computing the gradients.
     # In that case, override the automatic gradient function
+    primary_value_and_grad = None
     if "primary_gradient" in kwargs:
         grad_primary_theta = kwargs["primary_gradient"]
+    elif gradient_library == "autograd":
+        # When autograd provides the gradient, get the objective value
+        # and its gradient from a single traced pass instead of
+        # evaluating the objective once for the value and again
+        # inside grad()
+        primary_value_and_grad = value_and_grad(primary_objective)
 
     # Start gradient descent
     gd_index = 0
@@ -149,10 +179,13 @@ def gradient_descent_adam(
     for epoch in range(n_epochs):
         for batch_index in range(n_batches):
             if verbose:
-                if batch_index % 10 == 0:
+                if batch_index % verbose_every == 0:
                     print(f"Epoch: {epoch}, batch iteration {batch_index}")
             is_small_batch = batch_calculator(batch_index, batch_size)
-            primary_val = primary_objective(theta)
+            if primary_value_and_grad is not None:
+                primary_val, grad_primary_theta_val = primary_value_and_grad(theta)
+            else:
+                primary_val = primary_objective(theta)
             g_vec = upper_bounds_function(theta)
             L_val = primary_val + sum(lamb * g_vec)
 
@@ -209,7 +242,8 @@ def gradient_descent_adam(
 
             # Obtain gradients of both terms in Lagrangian
             # at current values of theta and lambda
-            grad_primary_theta_val = grad_primary_theta(theta)
+            if primary_value_and_grad is None:
+                grad_primary_theta_val = grad_primary_theta(theta)
             gu_theta_vec = grad_upper_bound_theta(theta)
 
             grad_secondary_theta_val_vec = (
@@ -222,23 +256,35 @@ def gradient_descent_adam(
             # gradient w.r.t. to lambda is just g
             gradient_lamb_vec = g_vec
 
-            # Momementum term
-            velocity_theta = (
-                beta_velocity * velocity_theta + (1.0 - beta_velocity) * gradient_theta
-            )
+            # Momementum term, updated in place
+            np.multiply(velocity_theta, beta_velocity, out=velocity_theta)
+            velocity_theta += (1.0 - beta_velocity) * gradient_theta
 
-            # RMS prop term
-            s_theta = beta_rmsprop * s_theta + (1.0 - beta_rmsprop) * pow(
-                gradient_theta, 2
-            )
+            # RMS prop term, updated in place
+            np.multiply(s_theta, beta_rmsprop, out=s_theta)
+            s_theta += (1.0 - beta_rmsprop) * pow(gradient_theta, 2)
 
             # bias-correction
             velocity_theta /= 1 - pow(beta_velocity, gd_index + 1)
             s_theta /= 1 - pow(beta_rmsprop, gd_index + 1)
 
             # update weights
+            if amsgrad:
+                np.maximum(s_theta_max, s_theta, out=s_theta_max)
+                s_theta_denom = s_theta_max
+            else:
+                s_theta_denom = s_theta
+            if nesterov:
+                # Nadam lookahead: blend the corrected momentum with
+                # the corrected current gradient instead of
+                # re-evaluating the gradient at a lookahead point
+                update_theta = beta_velocity * velocity_theta + (
+                    (1.0 - beta_velocity) / (1 - pow(beta_velocity, gd_index + 1))
+                ) * gradient_theta
+            else:
+                update_theta = velocity_theta
             theta -= (
-                alpha_theta * velocity_theta / (np.sqrt(s_theta) + rms_offset)
+                alpha_theta * update_theta / (np.sqrt(s_theta_denom) + rms_offset)
             )  # gradient descent
             lamb += alpha_lamb * gradient_lamb_vec  # element wise update
 
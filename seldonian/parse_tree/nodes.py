@@ -1,6 +1,3 @@
-from operator import itemgetter
-from functools import reduce, partial
-import pandas as pd
 import autograd.numpy as np
 
 from seldonian.models import zhat_funcs 
@@ -119,6 +116,22 @@ class BaseNode(Node):
         self.delta = 0
         self.measure_function_name = ""
 
+    # Flat dispatch table mapping
+    # (branch, will_lower_bound, will_upper_bound) to the name of
+    # the bound method to call. Replaces re-evaluating nested
+    # branching on every calculate_bounds call. Method names rather
+    # than bound methods are stored so that subclasses overriding
+    # the bound methods are dispatched correctly and nodes stay
+    # picklable
+    _HC_BOUND_FN_NAMES = {
+        ("candidate_selection", True, True): "predict_HC_upper_and_lowerbound",
+        ("candidate_selection", True, False): "predict_HC_lowerbound",
+        ("candidate_selection", False, True): "predict_HC_upperbound",
+        ("safety_test", True, True): "compute_HC_upper_and_lowerbound",
+        ("safety_test", True, False): "compute_HC_lowerbound",
+        ("safety_test", False, True): "compute_HC_upperbound",
+    }
+
     def __repr__(self):
         """Overrides Node.__repr__()"""
         return super().__repr__() + ", " + "\u03B4" + f"={self.delta:g}"
@@ -149,18 +162,56 @@ class BaseNode(Node):
         :return: The masked dataframe
         :rtype: numpy ndarray
         """
-        # Figure out indices of sensitive attributes from their column names
-        sensitive_col_indices = [
-            dataset.sensitive_col_names.index(col) for col in conditional_columns
-        ]
-
-        joint_mask = reduce(
-            np.logical_and,
-            (
-                dataset.sensitive_attrs[:, col_index] == 1
-                for col_index in sensitive_col_indices
-            ),
-        )
+        # The joint mask depends only on the dataset and the
+        # conditional columns, both of which are fixed during
+        # optimization, so cache it on the dataset object. Base nodes
+        # conditioning on the same columns (e.g. PR | [M] and
+        # FPR | [M]) then share a single precomputed boolean mask
+        mask_key = tuple(conditional_columns)
+        mask_cache = getattr(dataset, "_joint_mask_cache", None)
+        if mask_cache is None:
+            mask_cache = dataset._joint_mask_cache = {}
+
+        if mask_key in mask_cache:
+            joint_mask = mask_cache[mask_key]
+        else:
+            # Figure out indices of sensitive attributes from their
+            # column names, using a name->index dict built once per
+            # dataset instead of a list scan per column
+            col_to_index = getattr(dataset, "_sensitive_col_index", None)
+            if col_to_index is None:
+                col_to_index = dataset._sensitive_col_index = {
+                    col: ii
+                    for ii, col in enumerate(dataset.sensitive_col_names)
+                }
+            sensitive_col_indices = [
+                col_to_index[col] for col in conditional_columns
+            ]
+
+            if len(sensitive_col_indices) == 1:
+                # Single-column masks are the common case:
+                # one comparison, no reduction needed
+                joint_mask = (
+                    dataset.sensitive_attrs[:, sensitive_col_indices[0]] == 1
+                )
+            else:
+                # One C-level pass over the selected columns rather
+                # than pairwise logical_and reductions
+                joint_mask = (
+                    dataset.sensitive_attrs[:, sensitive_col_indices] == 1
+                ).all(axis=1)
+            mask_cache[mask_key] = joint_mask
+
+        # The gather itself (an O(N*D) copy) is also fixed per
+        # (dataset, conditional columns), so cache the masked arrays
+        # too. Base nodes conditioning on the same columns then share
+        # references to one masked copy instead of each making their own
+        masked_data_cache = getattr(dataset, "_masked_data_cache", None)
+        if masked_data_cache is None:
+            masked_data_cache = dataset._masked_data_cache = {}
+        if mask_key in masked_data_cache:
+            return masked_data_cache[mask_key]
+
         if dataset.regime == "supervised_learning":
             if type(dataset.features) == list:
                 masked_features = [x[joint_mask] for x in dataset.features]
@@ -178,10 +229,12 @@ class BaseNode(Node):
                 masked_features = dataset.features[joint_mask]
                 masked_labels = dataset.labels[joint_mask]
 
+            masked_data_cache[mask_key] = (masked_features, masked_labels)
             return masked_features, masked_labels
 
         elif dataset.regime == "reinforcement_learning":
             masked_episodes = np.asarray(dataset.episodes)[joint_mask]
+            masked_data_cache[mask_key] = masked_episodes
             return masked_episodes
 
     def calculate_data_forbound(self, **kwargs):
@@ -189,9 +242,11 @@ class BaseNode(Node):
         Prepare data inputs
         for confidence bound calculation.
         """
-        theta, dataset, model, regime, branch = itemgetter(
-            "theta", "dataset", "model", "regime", "branch"
-        )(kwargs)
+        theta = kwargs["theta"]
+        dataset = kwargs["dataset"]
+        model = kwargs["model"]
+        regime = kwargs["regime"]
+        branch = kwargs["branch"]
 
         if branch == "candidate_selection":
             # Then we're in candidate selection
@@ -241,14 +296,14 @@ class BaseNode(Node):
                 # when calculating the return
                 alt_reward_number = kwargs["alt_reward_number"]
                 alt_reward_index = alt_reward_number - 1
-                masked_returns = [
-                    weighted_sum_gamma(ep.alt_rewards[:, alt_reward_index], gamma)
-                    for ep in masked_episodes
-                ]
+                masked_returns = batch_weighted_sum_gamma(
+                    [ep.alt_rewards[:, alt_reward_index] for ep in masked_episodes],
+                    gamma,
+                )
             else:
-                masked_returns = [
-                    weighted_sum_gamma(ep.rewards, gamma) for ep in masked_episodes
-                ]
+                masked_returns = batch_weighted_sum_gamma(
+                    [ep.rewards for ep in masked_episodes], gamma
+                )
 
             data_dict = {
                 "episodes": masked_episodes,
@@ -268,8 +323,26 @@ class BaseNode(Node):
                 return {"lower": self.lower, "upper": self.upper}
 
             elif bound_method == "random":
-                # Randomly assign lower and upper bounds
-                lower, upper = (np.random.randint(0, 2), np.random.randint(2, 4))
+                # Randomly assign lower and upper bounds.
+                # Draw from a per-node PCG64 generator in batches
+                # rather than two one-element draws per call through
+                # the global legacy generator, which serializes on a
+                # process-wide lock. The buffer is built lazily so
+                # trees unpickled from older versions still work
+                buf = getattr(self, "_rand_buf", None)
+                if buf is None or self._rand_idx >= len(buf):
+                    rng = getattr(self, "_rng", None)
+                    if rng is None:
+                        rng = self._rng = np.random.default_rng()
+                    self._rand_buf = buf = np.column_stack(
+                        (
+                            rng.integers(0, 2, size=1024),
+                            rng.integers(2, 4, size=1024),
+                        )
+                    )
+                    self._rand_idx = 0
+                lower, upper = buf[self._rand_idx]
+                self._rand_idx += 1
                 return {"lower": lower, "upper": upper}
 
             else:
@@ -306,34 +379,28 @@ class BaseNode(Node):
                 # can't necessarily call lower and upper
                 # bound functions separately. Sometimes the joint bound
                 # is different from the individual bounds combined
+                dispatch_key = (
+                    branch,
+                    self.will_lower_bound,
+                    self.will_upper_bound,
+                )
+                try:
+                    bound_fn = getattr(
+                        self, self._HC_BOUND_FN_NAMES[dispatch_key]
+                    )
+                except KeyError:
+                    raise AssertionError(
+                        "will_lower_bound and will_upper_bound "
+                        "cannot both be False"
+                    )
+
                 if self.will_lower_bound and self.will_upper_bound:
-                    if branch == "candidate_selection":
-                        lower, upper = self.predict_HC_upper_and_lowerbound(
-                            **bound_kwargs
-                        )
-                    elif branch == "safety_test":
-                        lower, upper = self.compute_HC_upper_and_lowerbound(
-                            **bound_kwargs
-                        )
+                    lower, upper = bound_fn(**bound_kwargs)
                     return {"lower": lower, "upper": upper}
-
                 elif self.will_lower_bound:
-                    if branch == "candidate_selection":
-                        lower = self.predict_HC_lowerbound(**bound_kwargs)
-                    elif branch == "safety_test":
-                        lower = self.compute_HC_lowerbound(**bound_kwargs)
-                    return {"lower": lower}
-
-                elif self.will_upper_bound:
-                    if branch == "candidate_selection":
-                        upper = self.predict_HC_upperbound(**bound_kwargs)
-                    elif branch == "safety_test":
-                        upper = self.compute_HC_upperbound(**bound_kwargs)
-                    return {"upper": upper}
-
-                raise AssertionError(
-                    "will_lower_bound and will_upper_bound " "cannot both be False"
-                )
+                    return {"lower": bound_fn(**bound_kwargs)}
+                else:
+                    return {"upper": bound_fn(**bound_kwargs)}
 
         else:
             raise RuntimeError("bound_method not specified!")
@@ -383,9 +450,8 @@ class BaseNode(Node):
             bound_method = kwargs["bound_method"]
 
             if bound_method == "ttest":
-                lower = data.mean() - 2 * stddev(data) / np.sqrt(datasize) * tinv(
-                    1.0 - delta, datasize - 1
-                )
+                mean, sigma = mean_and_stddev(data)
+                lower = mean - ttest_half_width(sigma, datasize, delta, factor=2)
             else:
                 raise NotImplementedError(
                     f"Bounding method {bound_method} is not supported"
@@ -413,9 +479,8 @@ class BaseNode(Node):
         if "bound_method" in kwargs:
             bound_method = kwargs["bound_method"]
             if bound_method == "ttest":
-                lower = data.mean() + 2 * stddev(data) / np.sqrt(datasize) * tinv(
-                    1.0 - delta, datasize - 1
-                )
+                mean, sigma = mean_and_stddev(data)
+                lower = mean + ttest_half_width(sigma, datasize, delta, factor=2)
             else:
                 raise NotImplementedError(
                     f"Bounding method {bound_method} is not supported"
@@ -448,12 +513,13 @@ class BaseNode(Node):
         if "bound_method" in kwargs:
             bound_method = kwargs["bound_method"]
             if bound_method == "ttest":
-                lower = self.predict_HC_lowerbound(
-                    data=data, datasize=datasize, delta=delta / 2, **kwargs
-                )
-                upper = self.predict_HC_upperbound(
-                    data=data, datasize=datasize, delta=delta / 2, **kwargs
-                )
+                # The lower and upper bounds share the same mean and
+                # standard deviation, so compute those O(N) reductions
+                # once rather than once per bound
+                mean, sigma = mean_and_stddev(data)
+                half_width = ttest_half_width(sigma, datasize, delta / 2, factor=2)
+                lower = mean - half_width
+                upper = mean + half_width
 
             elif bound_method == "manual":
                 pass
@@ -483,9 +549,8 @@ class BaseNode(Node):
         if "bound_method" in kwargs:
             bound_method = kwargs["bound_method"]
             if bound_method == "ttest":
-                lower = data.mean() - stddev(data) / np.sqrt(datasize) * tinv(
-                    1.0 - delta, datasize - 1
-                )
+                mean, sigma = mean_and_stddev(data)
+                lower = mean - ttest_half_width(sigma, datasize, delta)
             else:
                 raise NotImplementedError(
                     f"Bounding method {bound_method}" " is not supported"
@@ -511,9 +576,8 @@ class BaseNode(Node):
         if "bound_method" in kwargs:
             bound_method = kwargs["bound_method"]
             if bound_method == "ttest":
-                upper = data.mean() + stddev(data) / np.sqrt(datasize) * tinv(
-                    1.0 - delta, datasize - 1
-                )
+                mean, sigma = mean_and_stddev(data)
+                upper = mean + ttest_half_width(sigma, datasize, delta)
             else:
                 raise NotImplementedError(
                     f"Bounding method {bound_method}" " is not supported"
@@ -545,12 +609,12 @@ class BaseNode(Node):
         if "bound_method" in kwargs:
             bound_method = kwargs["bound_method"]
             if bound_method == "ttest":
-                lower = self.compute_HC_lowerbound(
-                    data=data, datasize=datasize, delta=delta / 2, **kwargs
-                )
-                upper = self.compute_HC_upperbound(
-                    data=data, datasize=datasize, delta=delta / 2, **kwargs
-                )
+                # Share the mean and standard deviation between the
+                # two bounds instead of recomputing them per bound
+                mean, sigma = mean_and_stddev(data)
+                half_width = ttest_half_width(sigma, datasize, delta / 2)
+                lower = mean - half_width
+                upper = mean + half_width
 
             elif bound_method == "manual":
                 pass
@@ -764,7 +828,7 @@ class MEDCustomBaseNode(BaseNode):
         """
         dataset = kwargs["dataset"]
         features = dataset.features
-        labels = np.expand_dims(dataset.labels, axis=1)
+        labels = dataset.labels
         sensitive_attrs = dataset.sensitive_attrs
 
         data_dict = self.precalculate_data(features, labels, sensitive_attrs)
@@ -778,37 +842,33 @@ class MEDCustomBaseNode(BaseNode):
         recalculated on each iteration through the parse tree
 
         :param X: features
-        :type X: pandas dataframe
+        :type X: numpy ndarray
 
         :param Y: labels
-        :type Y: pandas dataframe
+        :type Y: numpy ndarray
         """
         male_mask = S[:, 0] == 1
+        female_mask = ~male_mask
 
         X_male = X[male_mask]
         Y_male = Y[male_mask]
-        X_female = X[~male_mask]
-        Y_female = Y[~male_mask]
+        X_female = X[female_mask]
+        Y_female = Y[female_mask]
         N_male = len(X_male)
         N_female = len(X_female)
         N_least = min(N_male, N_female)
 
-        # sample N_least from both without repeats
-        XY_male = np.hstack([X_male, Y_male])  # column stack
-        ix_sample_male = np.random.choice(
-            range(len(XY_male)), size=N_least, replace=True
-        )
-        XY_male = XY_male[ix_sample_male, :]
-        X_male = XY_male[:, :-1]
-        Y_male = XY_male[:, -1]
-
-        XY_female = np.hstack([X_female, Y_female])  # column stack
-        ix_sample_female = np.random.choice(
-            range(len(XY_female)), size=N_least, replace=True
-        )
-        XY_female = XY_female[ix_sample_female, :]
-        X_female = XY_female[:, :-1]
-        Y_female = XY_female[:, -1]
+        # sample N_least from both without repeats.
+        # Sampling integer row indices and applying them to features
+        # and labels separately avoids column-stacking and re-splitting
+        # the arrays just to keep the rows paired
+        ix_sample_male = np.random.choice(N_male, size=N_least, replace=True)
+        X_male = X_male[ix_sample_male]
+        Y_male = Y_male[ix_sample_male]
+
+        ix_sample_female = np.random.choice(N_female, size=N_least, replace=True)
+        X_female = X_female[ix_sample_female]
+        Y_female = Y_female[ix_sample_female]
 
         data_dict = {
             "X_male": X_male,
@@ -14,6 +14,30 @@ from .operators import *
 
 default_bound_method = "ttest"
 
+# Base-node prefixes that may appear subscripted in a constraint
+# string, e.g. CM_[0,1] or PR_[2]. Built once at import instead of
+# as a list literal on every _parse_subscript call
+supported_subscript_ids = frozenset(
+    (
+        "CM_",
+        "PR_",
+        "NR_",
+        "FPR_",
+        "TNR_",
+        "TPR_",
+        "FNR_",
+        "J_pi_new_",
+        "J_pi_new_PDIS_",
+    )
+)
+
+# node_type -> (style, fillcolor) for graphviz diagrams. Looked up
+# once per child in make_viz_helper instead of an if/elif chain
+node_viz_styles = {
+    "base_node": ("filled", "green"),
+    "constant_node": ("filled", "yellow"),
+}
+
 
 class ParseTree(object):
     def __init__(self, delta, regime, sub_regime, columns=[]):
@@ -84,10 +108,14 @@ class ParseTree(object):
         self.n_nodes = 0
         self.n_base_nodes = 0
         self.base_node_dict = {}
+        self._postorder_nodes = None
+        self._propagation_program = None
         self.node_fontsize = 12
-        self.available_measure_functions = measure_functions_dict[self.regime][
-            self.sub_regime
-        ]
+        # frozenset for O(1) membership tests; every ast node
+        # parsed is checked against this collection
+        self.available_measure_functions = frozenset(
+            measure_functions_dict[self.regime][self.sub_regime]
+        )
 
     def build_tree(self, constraint_str, delta_weight_method="equal"):
         """
@@ -127,6 +155,14 @@ class ParseTree(object):
         preprocessed_s = self._preprocess_constraint_str(s)
         self.constraint_str = preprocessed_s
         self.node_index = 0
+        # Flat list of the BaseNode objects in the tree (including
+        # duplicate appearances), collected as the tree is built so
+        # assign_deltas does not need to walk the whole tree.
+        # Also invalidate the derived traversal caches in case the
+        # tree is being rebuilt
+        self._base_nodes = []
+        self._postorder_nodes = None
+        self._propagation_program = None
 
         tree = ast.parse(preprocessed_s)
         # makes sure this is a single expression
@@ -135,9 +171,18 @@ class ParseTree(object):
         expr = tree.body[0]
         root = expr.value
 
-        # Recursively build the tree
+        # Build the tree from the ast
         self.root = self._ast_tree_helper(root)
 
+        # The tree shape is now fixed, so precompute the traversal
+        # order and propagation program here rather than lazily on
+        # the first propagation. propagate_bounds is typically called
+        # once per candidate solution in an outer optimization loop,
+        # and this keeps every one of those calls a plain sweep over
+        # the precomputed lists
+        self._postorder_nodes = self._build_postorder_list()
+        self._propagation_program = self._build_propagation_program()
+
     def _preprocess_constraint_str(self, s):
         """
         Check if inequalities present and
@@ -187,20 +232,103 @@ class ParseTree(object):
                 )
         return new_s
 
-    def _ast_tree_helper(self, ast_node):
+    def _ast_tree_helper(self, root_ast_node):
         """
         From a given node in the ast tree,
-        make a node in the tree and recurse
+        make a node in the tree and walk
         to children of this node.
+        Uses an explicit worklist instead of recursion, so deep
+        constraint expressions do not pay a Python stack frame
+        per ast node
 
-        :param ast_node: node in the ast tree
-        :type ast_node: ast.AST node object
+        :param root_ast_node: node in the ast tree
+        :type root_ast_node: ast.AST node object
         """
-        # base case
-        if ast_node is None:
+        if root_ast_node is None:
             return None
 
-        is_parent = False
+        subtree_root = None
+        # Each entry is (ast node to convert, parse-tree parent to
+        # attach the converted node to, attribute name on that
+        # parent). Children are pushed right-before-left so nodes
+        # are created, and therefore numbered, in the same
+        # pre-order the recursive version produced
+        worklist = [(root_ast_node, None, None)]
+        while worklist:
+            ast_node, parent, slot = worklist.pop()
+            if ast_node is None:
+                continue
+            new_node, new_node_parent, is_leaf, ast_node = self._make_pt_node(
+                ast_node
+            )
+
+            attach_node = new_node_parent if new_node_parent is not None else new_node
+            if parent is None:
+                subtree_root = attach_node
+            else:
+                setattr(parent, slot, attach_node)
+
+            # If node is a leaf node, don't check for children
+            if is_leaf:
+                continue
+
+            left_child = getattr(ast_node, "left", None)
+            right_child = getattr(ast_node, "right", None)
+
+            # Handle functions like min(), abs(), etc...
+            if hasattr(ast_node, "args") and (
+                ast_node.func.id not in self.available_measure_functions
+            ):
+                if len(ast_node.args) == 0:
+                    raise RuntimeError(
+                        "Please check the syntax of the function: "
+                        f" {new_node.name}()."
+                        " It appears you provided no arguments"
+                    )
+                elif len(ast_node.args) > 2:
+                    raise RuntimeError(
+                        "Please check the syntax of the function:"
+                        f" {new_node.name}()."
+                        " It appears you provided more than two arguments"
+                    )
+                if ast_node.func.id in ["abs", "exp", "log"] and len(ast_node.args) > 1:
+                    raise RuntimeError(
+                        "Please check the syntax of the function:"
+                        f" {new_node.name}()."
+                        " It appears you provided more than one argument"
+                    )
+                if ast_node.func.id in ["min", "max"] and len(ast_node.args) == 1:
+                    raise RuntimeError(
+                        "Please check the syntax of the function: "
+                        f"{new_node.name}(). "
+                        "This function must take two arguments."
+                    )
+                left_child = ast_node.args[0]
+                if len(ast_node.args) > 1:
+                    right_child = ast_node.args[1]
+
+            if right_child is not None:
+                worklist.append((right_child, new_node, "right"))
+            if left_child is not None:
+                worklist.append((left_child, new_node, "left"))
+
+        return subtree_root
+
+    def _make_pt_node(self, ast_node):
+        """
+        Convert a single ast node into a parse-tree node,
+        assigning its index and registering base nodes in
+        base_node_dict. Unary minus on a non-constant operand
+        becomes a (-1 * operand) subtree, in which case the
+        returned parent node is the mult node and the returned
+        ast node is the operand whose children still need walking
+
+        :param ast_node: node in the ast tree
+        :type ast_node: ast.AST node object
+        :return: (new node, its wrapper parent or None, whether the
+                new node is a leaf, the ast node to take children from)
+        """
+        new_node_parent = None
 
         # handle unary operator like "-var"
         if isinstance(ast_node, ast.UnaryOp):
@@ -235,7 +363,6 @@ class ParseTree(object):
                 new_node, is_leaf = self._ast2pt_node(ast_node.operand)
                 new_node_parent.right = new_node
                 new_node_parent.right.index = self.node_index
-                is_parent = True
                 ast_node = ast_node.operand
 
         else:
@@ -243,6 +370,7 @@ class ParseTree(object):
 
         if isinstance(new_node, BaseNode):
             self.n_base_nodes += 1
+            self._base_nodes.append(new_node)
 
             # strip out conditional columns and parentheses
             # to get the measure function name
@@ -278,55 +406,7 @@ class ParseTree(object):
         new_node.index = self.node_index
         self.node_index += 1
 
-        # If node is a leaf node, don't check for children
-        if is_leaf:
-            if is_parent:
-                return new_node_parent
-            return new_node
-        # otherwise we are at an internal node
-        # and need to recurse
-        if hasattr(ast_node, "left"):
-            new_node.left = self._ast_tree_helper(ast_node.left)
-        if hasattr(ast_node, "right"):
-            new_node.right = self._ast_tree_helper(ast_node.right)
-
-        # Handle functions like min(), abs(), etc...
-        if hasattr(ast_node, "args") and (
-            ast_node.func.id not in self.available_measure_functions
-        ):
-            if len(ast_node.args) == 0:
-                raise RuntimeError(
-                    "Please check the syntax of the function: "
-                    f" {new_node.name}()."
-                    " It appears you provided no arguments"
-                )
-            elif len(ast_node.args) > 2:
-                raise RuntimeError(
-                    "Please check the syntax of the function:"
-                    f" {new_node.name}()."
-                    " It appears you provided more than two arguments"
-                )
-            if ast_node.func.id in ["abs", "exp", "log"] and len(ast_node.args) > 1:
-                raise RuntimeError(
-                    "Please check the syntax of the function:"
-                    f" {new_node.name}()."
-                    " It appears you provided more than one argument"
-                )
-            if ast_node.func.id in ["min", "max"] and len(ast_node.args) == 1:
-                raise RuntimeError(
-                    "Please check the syntax of the function: "
-                    f"{new_node.name}(). "
-                    "This function must take two arguments."
-                )
-            for ii, arg in enumerate(ast_node.args):
-                if ii == 0:
-                    new_node.left = self._ast_tree_helper(arg)
-                if ii == 1:
-                    new_node.right = self._ast_tree_helper(arg)
-
-        if is_parent:
-            return new_node_parent
-        return new_node
+        return new_node, new_node_parent, is_leaf, ast_node
 
     def _ast2pt_node(self, ast_node):
         """
@@ -469,17 +549,7 @@ class ParseTree(object):
         return node_class(node_name), is_leaf
 
     def _parse_subscript(self, ast_node):
-        if ast_node.value.id not in [
-            "CM_",
-            "PR_",
-            "NR_",
-            "FPR_",
-            "TNR_",
-            "TPR_",
-            "FNR_",
-            "J_pi_new_",
-            "J_pi_new_PDIS_"
-        ]:
+        if ast_node.value.id not in supported_subscript_ids:
             raise NotImplementedError(
                 "Error parsing your expression."
                 " A subscript was used in a way we do not support: "
@@ -556,30 +626,24 @@ class ParseTree(object):
             "Number of base nodes must be > 0."
             " Make sure to build the tree before assigning deltas."
         )
-        self._assign_deltas_helper(self.root, weight_method, **kwargs)
-
-    def _assign_deltas_helper(self, node, weight_method, **kwargs):
-        """
-        Helper function to traverse the parse tree
-        and assign delta values to base nodes.
-
-        :param node: node in the parse tree
-        :type node: :py:class:`.Node` object
-        :param weight_method:
-                How you want to assign the deltas to the base nodes
-        :type weight_method: str
-        """
-
-        if not node:
-            return
-
-        if isinstance(node, BaseNode):  # captures all child classes of BaseNode as well
-            if weight_method == "equal":
-                node.delta = self.delta / len(self.base_node_dict)
-
-        self._assign_deltas_helper(node.left, weight_method)
-        self._assign_deltas_helper(node.right, weight_method)
-        return
+        # Only base nodes receive deltas, so loop over the flat
+        # base-node list instead of walking the whole tree. Built
+        # from the post-order flattening if the tree was assembled
+        # by hand rather than through create_from_ast
+        base_nodes = getattr(self, "_base_nodes", None)
+        if base_nodes is None:
+            if getattr(self, "_postorder_nodes", None) is None:
+                self._postorder_nodes = self._build_postorder_list()
+            base_nodes = self._base_nodes = [
+                node
+                for node in self._postorder_nodes
+                if isinstance(node, BaseNode)
+            ]
+
+        if weight_method == "equal":
+            delta_each_node = self.delta / len(self.base_node_dict)
+            for node in base_nodes:
+                node.delta = delta_each_node
 
     def assign_bounds_needed(self, **kwargs):
         """
@@ -691,74 +755,178 @@ class ParseTree(object):
         if not self.root:
             return []
 
-        self._propagator_helper(self.root, **kwargs)
+        # The tree topology is fixed once it is built,
+        # but bounds are propagated once per iteration of the
+        # optimizer. Compile the tree one time into a flat post-order
+        # program with the operator dispatch pre-resolved per node,
+        # and interpret that program on each call rather than
+        # recursing through the node objects and re-dispatching.
+        # Built lazily because trees can also be assembled by hand
+        # without going through build_tree
+        if getattr(self, "_propagation_program", None) is None:
+            self._propagation_program = self._build_propagation_program()
+
+        for kind, node, op_fn, is_binary in self._propagation_program:
+            if kind == self._PROGRAM_BASE:
+                self._propagator_helper(node, **kwargs)
+            elif kind == self._PROGRAM_FAST_OP:
+                left = node.left
+                if is_binary:
+                    right = node.right
+                    node.lower, node.upper = op_fn(
+                        self, left.lower, left.upper, right.lower, right.upper
+                    )
+                else:
+                    node.lower, node.upper = op_fn(self, left.lower, left.upper)
+            else:
+                # Operators needing the generic path, e.g. pow with
+                # its experimental-feature warning
+                node.lower, node.upper = self.propagate(node)
+
+    # Instruction kinds for the compiled propagation program
+    _PROGRAM_BASE = 0
+    _PROGRAM_FAST_OP = 1
+    _PROGRAM_GENERIC_OP = 2
+
+    def _build_propagation_program(self):
+        """
+        Flatten the tree into a list of
+        (kind, node, op function, is_binary) instructions in
+        post-order. Constant nodes carry their bounds from
+        construction and are omitted entirely; internal nodes get
+        their interval-arithmetic function resolved here once
+        instead of on every propagation
+
+        :return: List of instructions for propagate_bounds
+        :rtype: List(tuple)
+        """
+        if getattr(self, "_postorder_nodes", None) is None:
+            self._postorder_nodes = self._build_postorder_list()
+
+        program = []
+        for node in self._postorder_nodes:
+            if isinstance(node, ConstantNode):
+                continue
+            if isinstance(node, BaseNode):
+                program.append((self._PROGRAM_BASE, node, None, False))
+                continue
+            dispatch = self._BOUND_OP_DISPATCH.get(node.name)
+            if dispatch is None:
+                # Unknown operators raise inside propagate()
+                program.append((self._PROGRAM_GENERIC_OP, node, None, False))
+            elif node.name == "pow":
+                right = node.right
+                if (
+                    right is not None
+                    and right.node_type == "constant_node"
+                    and float(right.value).is_integer()
+                ):
+                    # Constant integer exponent, e.g. x**2: pow is
+                    # monotone for the non-negative bases we allow,
+                    # so a specialized two-power rule applies
+                    program.append(
+                        (self._PROGRAM_FAST_OP, node, ParseTree._pow_intk, True)
+                    )
+                else:
+                    program.append((self._PROGRAM_GENERIC_OP, node, None, False))
+            else:
+                op_fn, is_binary = dispatch
+                program.append((self._PROGRAM_FAST_OP, node, op_fn, is_binary))
+        return program
+
+    def _build_postorder_list(self):
+        """
+        Flatten the tree into a list of nodes in post-order
+        (left, right, root), using an explicit stack rather
+        than recursion
+
+        :return: List of nodes in post-order
+        :rtype: List(:py:class:`.Node` objects)
+        """
+        postorder = []
+        stack = [(self.root, False)]
+        while stack:
+            node, children_visited = stack.pop()
+            if node is None:
+                continue
+            if children_visited:
+                postorder.append(node)
+            else:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+        return postorder
 
     def _propagator_helper(self, node, **kwargs):
         """
-        Helper function for traversing
-        through the tree and propagating confidence bounds
+        Calculate or propagate confidence bounds for a single node.
+        Called on each node of the tree in post-order, so by the
+        time an internal node is visited its children already have
+        their bounds set
 
         :param node: node in the parse tree
         :type node: :py:class:`.Node` object
         """
 
         # if we hit a constant node or run past the end of the tree
-        # return because we don't need to calculate bounds
-        if not node or isinstance(node, ConstantNode):
+        # return because we don't need to calculate bounds.
+        # node_type is a plain string compare, cheaper than an
+        # isinstance() MRO walk on this per-iteration path
+        if not node or node.node_type == "constant_node":
             return
 
         # if we hit a BaseNode,
         # then calculate confidence bounds and return
-        if isinstance(node, BaseNode):
+        if node.node_type == "base_node":
+            # Bind the entry for this node name once rather than
+            # re-hashing the name for every field access below
+            entry = self.base_node_dict[node.name]
             # Check if bound has already been calculated for this node name
             # If so, use precalculated bound
-            if self.base_node_dict[node.name]["bound_computed"] == True:
-                node.lower = self.base_node_dict[node.name]["lower"]
-                node.upper = self.base_node_dict[node.name]["upper"]
+            if entry["bound_computed"] == True:
+                node.lower = entry["lower"]
+                node.upper = entry["upper"]
                 return
             else:
                 # Need to calculate the bound
                 if "dataset" in kwargs:
                     # Check if data has already been prepared
                     # for this node name. If so, use precalculated data
-                    if self.base_node_dict[node.name]["data_dict"] != None:
-                        data_dict = self.base_node_dict[node.name]["data_dict"]
+                    if entry["data_dict"] != None:
+                        data_dict = entry["data_dict"]
                     else:
                         # Data not prepared already. Need to do that.
                         if isinstance(node, RLAltRewardBaseNode):
                             kwargs["alt_reward_number"] = node.alt_reward_number
-                        
+
                         data_dict = node.calculate_data_forbound(**kwargs)
-                        self.base_node_dict[node.name]["data_dict"] = data_dict
+                        entry["data_dict"] = data_dict
 
                     kwargs["data_dict"] = data_dict
 
-                bound_method = self.base_node_dict[node.name]["bound_method"]
-                
+                bound_method = entry["bound_method"]
+
                 if isinstance(node, ConfusionMatrixBaseNode):
                     kwargs["cm_true_index"] = node.cm_true_index
                     kwargs["cm_pred_index"] = node.cm_pred_index
-                
+
                 bound_result = node.calculate_bounds(
                     bound_method=bound_method, **kwargs
                 )
-                self.base_node_dict[node.name]["bound_computed"] = True
+                entry["bound_computed"] = True
 
                 if node.will_lower_bound:
                     node.lower = bound_result["lower"]
-                    self.base_node_dict[node.name]["lower"] = node.lower
+                    entry["lower"] = node.lower
 
                 if node.will_upper_bound:
                     node.upper = bound_result["upper"]
-                    self.base_node_dict[node.name]["upper"] = node.upper
+                    entry["upper"] = node.upper
 
             return
 
-        # traverse to children first
-        self._propagator_helper(node.left, **kwargs)
-        self._propagator_helper(node.right, **kwargs)
-
-        # Here we must be at an internal node and therefore need to propagate
+        # Here we must be at an internal node. Its children were
+        # already visited by the post-order sweep, so propagate
         node.lower, node.upper = self.propagate(node)
 
     def evaluate_constraint(self, **kwargs):
@@ -772,60 +940,70 @@ class ParseTree(object):
         if not self.root:
             return []
 
-        self._evaluator_helper(self.root, **kwargs)
+        # Sweep over the same cached post-order flattening of the
+        # tree that propagate_bounds uses, instead of recursing
+        # through the node objects on every call
+        if getattr(self, "_postorder_nodes", None) is None:
+            self._postorder_nodes = self._build_postorder_list()
+
+        for node in self._postorder_nodes:
+            self._evaluator_helper(node, **kwargs)
 
     def _evaluator_helper(self, node, **kwargs):
         """
-        Helper function for traversing
-        through the tree to evaluate the constraint
+        Evaluate a single node of the tree. Called on each node in
+        post-order, so by the time an internal node is visited its
+        children already have their values set
 
         :param node: node in the parse tree
         :type node: :py:class:`.Node` object
         """
 
         # if we hit a constant node or run past the end of the tree
-        # return because we don't need to calculate anything
-        if not node or isinstance(node, ConstantNode):
+        # return because we don't need to calculate anything.
+        # node_type is a plain string compare, cheaper than an
+        # isinstance() MRO walk on this per-iteration path
+        if not node or node.node_type == "constant_node":
             return
 
         # if we hit a BaseNode,
         # then calculate the value and return
-        if isinstance(node, BaseNode):
+        if node.node_type == "base_node":
+            # Bind the entry for this node name once rather than
+            # re-hashing the name for every field access below
+            entry = self.base_node_dict[node.name]
             # Check if value has already been calculated for this node name
             # If so, use precalculated value
-            if self.base_node_dict[node.name]["value_computed"] == True:
-                node.value = self.base_node_dict[node.name]["value"]
+            if entry["value_computed"] == True:
+                node.value = entry["value"]
                 return
             else:
                 if "dataset" in kwargs:
                     # Check if data has already been prepared
                     # for this node name. If so, use precalculated data
-                    if self.base_node_dict[node.name]["data_dict"] != None:
-                        data_dict = self.base_node_dict[node.name]["data_dict"]
+                    if entry["data_dict"] != None:
+                        data_dict = entry["data_dict"]
                     else:
                         if isinstance(node, RLAltRewardBaseNode):
                             kwargs["alt_reward_number"] = node.alt_reward_number
                         data_dict = node.calculate_data_forbound(**kwargs)
-                        self.base_node_dict[node.name]["data_dict"] = data_dict
+                        entry["data_dict"] = data_dict
 
                     kwargs["data_dict"] = data_dict
 
                 if isinstance(node, ConfusionMatrixBaseNode):
                     kwargs["cm_true_index"] = node.cm_true_index
                     kwargs["cm_pred_index"] = node.cm_pred_index
-                
+
                 value = node.calculate_value(**kwargs)
                 node.value = value
-                self.base_node_dict[node.name]["value_computed"] = True
-                self.base_node_dict[node.name]["value"] = node.value
+                entry["value_computed"] = True
+                entry["value"] = node.value
 
             return
 
-        # traverse to children first
-        self._evaluator_helper(node.left, **kwargs)
-        self._evaluator_helper(node.right, **kwargs)
-
-        # Here we must be at an internal node and therefore need to propagate
+        # Here we must be at an internal node. Its children were
+        # already visited by the post-order sweep, so propagate
         node.value = self._propagate_value(node)
 
     def _propagate_value(self, node):
@@ -893,7 +1071,11 @@ class ParseTree(object):
                 'lower' or 'upper'
         :type bound_type: str
         """
-        if np.isnan(bound):
+        # NaN is the only value that does not equal itself. This
+        # check avoids routing every scalar bound through numpy's
+        # ufunc machinery (np.isnan) and, unlike math.isnan, still
+        # works when the bound is an autograd box during tracing
+        if bound != bound:
             if bound_type == "lower":
                 return float("-inf")
             if bound_type == "upper":
@@ -903,271 +1085,340 @@ class ParseTree(object):
 
     def propagate(self, node):
         """
-        Helper function for propagating confidence bounds
+        Helper function for propagating confidence bounds.
+        Dispatches to the interval-arithmetic method for the node's
+        operator through a class-level dict (one hashed lookup)
+        rather than a chain of string comparisons
 
         :param node: node in the parse tree
         :type node: :py:class:`.Node` object
         """
-        if node.name == "add":
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._add(a, b)
-
-        if node.name == "sub":
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._sub(a, b)
-
-        if node.name == "mult":
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._mult(a, b)
-
-        if node.name == "div":
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._div(a, b)
-
         if node.name == "pow":
             warning_msg = (
                 "Warning: Power operation "
                 "is an experimental feature. Use with caution."
             )
             warnings.warn(warning_msg)
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._pow(a, b)
 
-        if node.name == "min":
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._min(a, b)
-
-        if node.name == "max":
-            a = (node.left.lower, node.left.upper)
-            b = (node.right.lower, node.right.upper)
-            return self._max(a, b)
-
-        if node.name == "abs":
-            # takes one node
-            a = (node.left.lower, node.left.upper)
-            return self._abs(a)
-
-        if node.name == "exp":
-            # takes one node
-            a = (node.left.lower, node.left.upper)
-            return self._exp(a)
-
-        if node.name == "log":
-            # takes one node
-            a = (node.left.lower, node.left.upper)
-            return self._log(a)
-
-        else:
+        try:
+            op_fn, is_binary = self._BOUND_OP_DISPATCH[node.name]
+        except KeyError:
             raise NotImplementedError(
                 "Encountered an operation we do not yet support", node.name
             )
 
-    def _add(self, a, b):
-        """
-        Add two confidence intervals
+        left = node.left
+        if is_binary:
+            right = node.right
+            return op_fn(self, left.lower, left.upper, right.lower, right.upper)
+        return op_fn(self, left.lower, left.upper)
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+    def _add(self, a_lower, a_upper, b_lower, b_upper):
+        """
+        Add two confidence intervals.
+        The interval endpoints are passed as four scalars rather
+        than two tuples to avoid building and indexing tuples on
+        the per-iteration propagation path
+
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
-        lower = self._protect_nan(a[0] + b[0], "lower")
+        lower = self._protect_nan(a_lower + b_lower, "lower")
 
-        upper = self._protect_nan(a[1] + b[1], "upper")
+        upper = self._protect_nan(a_upper + b_upper, "upper")
 
         return (lower, upper)
 
-    def _sub(self, a, b):
+    def _sub(self, a_lower, a_upper, b_lower, b_upper):
         """
         Subract two confidence intervals
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
-        lower = self._protect_nan(a[0] - b[1], "lower")
+        lower = self._protect_nan(a_lower - b_upper, "lower")
 
-        upper = self._protect_nan(a[1] - b[0], "upper")
+        upper = self._protect_nan(a_upper - b_lower, "upper")
 
         return (lower, upper)
 
-    def _mult(self, a, b):
+    def _mult(self, a_lower, a_upper, b_lower, b_upper):
         """
-        Multiply two confidence intervals
-
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+        Multiply two confidence intervals.
+        When the sign of each interval is known the product interval
+        has a closed form needing only two multiplications, and
+        bounds in ML constraints (rates, probabilities, losses) are
+        usually sign-definite. Only when both intervals straddle
+        zero, or a 0 endpoint meets an infinite one, is the generic
+        four-product reduction needed
+
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
-        lower = self._protect_nan(
-            min(a[0] * b[0], a[0] * b[1], a[1] * b[0], a[1] * b[1]), "lower"
+        lower = None
+        upper = None
+        # A zero endpoint on one side against an infinite endpoint
+        # on the other makes 0 * inf = NaN. The closed forms below
+        # skip some of the endpoint products, so they would miss the
+        # NaN and return a tighter interval than the four-product
+        # reduction, which turns it into the conservative
+        # (-inf, inf) via _protect_nan. Keep the original behavior
+        # by sending those cases down the generic path
+        zero_inf_mix = (
+            (a_lower == 0 or a_upper == 0)
+            and (b_lower == float("-inf") or b_upper == float("inf"))
+        ) or (
+            (b_lower == 0 or b_upper == 0)
+            and (a_lower == float("-inf") or a_upper == float("inf"))
         )
+        if zero_inf_mix:
+            pass
+        elif a_lower >= 0:
+            # a is non-negative
+            if b_lower >= 0:
+                lower = a_lower * b_lower
+                upper = a_upper * b_upper
+            elif b_upper <= 0:
+                lower = a_upper * b_lower
+                upper = a_lower * b_upper
+            else:
+                lower = a_upper * b_lower
+                upper = a_upper * b_upper
+        elif a_upper <= 0:
+            # a is non-positive
+            if b_lower >= 0:
+                lower = a_lower * b_upper
+                upper = a_upper * b_lower
+            elif b_upper <= 0:
+                lower = a_upper * b_upper
+                upper = a_lower * b_lower
+            else:
+                lower = a_lower * b_upper
+                upper = a_lower * b_lower
+        else:
+            # a straddles zero
+            if b_lower >= 0:
+                lower = a_lower * b_upper
+                upper = a_upper * b_upper
+            elif b_upper <= 0:
+                lower = a_upper * b_lower
+                upper = a_lower * b_lower
 
-        upper = self._protect_nan(
-            max(a[0] * b[0], a[0] * b[1], a[1] * b[0], a[1] * b[1]), "upper"
-        )
+        if lower is not None and lower == lower and upper == upper:
+            return (lower, upper)
+
+        # Both intervals straddle zero (or a zero endpoint met an
+        # infinite one): compute the four endpoint products once and
+        # reuse them in both the min and the max
+        prod_ll = a_lower * b_lower
+        prod_lu = a_lower * b_upper
+        prod_ul = a_upper * b_lower
+        prod_uu = a_upper * b_upper
+
+        lower = self._protect_nan(min(prod_ll, prod_lu, prod_ul, prod_uu), "lower")
+
+        upper = self._protect_nan(max(prod_ll, prod_lu, prod_ul, prod_uu), "upper")
 
         return (lower, upper)
 
-    def _div(self, a, b):
+    def _div(self, a_lower, a_upper, b_lower, b_upper):
         """
         Divide two confidence intervals
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
 
-        if b[0] < 0 < b[1]:
+        # Common case first: b is entirely positive or entirely
+        # negative, so division reduces to multiplication by the
+        # reciprocal interval [1/b_upper, 1/b_lower]
+        if b_lower > 0 or b_upper < 0:
+            return self._mult(a_lower, a_upper, 1 / b_upper, 1 / b_lower)
+
+        if b_lower < 0 < b_upper:
             # unbounded
-            lower = float("-inf")
-            upper = float("inf")
-
-        elif b[1] == 0:
-            # reduces to multiplication of a*(-inf,1/b[0]]
-            new_b = (float("-inf"), 1 / b[0])
-            lower, upper = self._mult(a, new_b)
-
-        elif b[0] == 0:
-            # reduces to multiplication of a*(1/b[1],+inf)
-            new_b = (1 / b[1], float("inf"))
-            lower, upper = self._mult(a, new_b)
-        else:
-            # b is either entirely negative or positive
-            # reduces to multiplication of a*(1/b[1],1/b[0])
-            new_b = (1 / b[1], 1 / b[0])
-            lower, upper = self._mult(a, new_b)
+            return (float("-inf"), float("inf"))
 
-        return (lower, upper)
+        if b_upper == 0:
+            # reduces to multiplication of a*(-inf,1/b_lower]
+            return self._mult(a_lower, a_upper, float("-inf"), 1 / b_lower)
+
+        # b_lower == 0
+        # reduces to multiplication of a*(1/b_upper,+inf)
+        return self._mult(a_lower, a_upper, 1 / b_upper, float("inf"))
 
-    def _pow(self, a, b):
+    def _pow(self, a_lower, a_upper, b_lower, b_upper):
         """
         Get the confidence interval on
         pow(a,b) where
-        b and b are both be intervals
+        a and b are both intervals
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
 
         # First, cases that are not allowed
-        if a[0] < 0:
+        if a_lower < 0:
             raise ArithmeticError(
-                f"Cannot compute interval: pow({a},{b}) because first argument contains negatives"
+                f"Cannot compute interval: pow({(a_lower, a_upper)},{(b_lower, b_upper)})"
+                " because first argument contains negatives"
             )
-        if 0 in a and (b[0] < 0 or b[1] < 1):
+        if 0 in (a_lower, a_upper) and (b_lower < 0 or b_upper < 1):
             raise ZeroDivisionError("0.0 cannot be raised to a negative power")
-        lower = self._protect_nan(
-            min(pow(a[0], b[0]), pow(a[0], b[1]), pow(a[1], b[0]), pow(a[1], b[1])),
-            "lower",
-        )
+        # Compute the four endpoint powers once and reuse them in
+        # both the min and the max
+        pow_ll = pow(a_lower, b_lower)
+        pow_lu = pow(a_lower, b_upper)
+        pow_ul = pow(a_upper, b_lower)
+        pow_uu = pow(a_upper, b_upper)
+
+        lower = self._protect_nan(min(pow_ll, pow_lu, pow_ul, pow_uu), "lower")
+
+        upper = self._protect_nan(max(pow_ll, pow_lu, pow_ul, pow_uu), "upper")
+
+        return (lower, upper)
 
-        upper = self._protect_nan(
-            max(pow(a[0], b[0]), pow(a[0], b[1]), pow(a[1], b[0]), pow(a[1], b[1])),
-            "upper",
+    def _pow_intk(self, a_lower, a_upper, b_lower, b_upper):
+        """
+        Get the confidence interval on
+        pow(a,k) where a is an interval and
+        the exponent is a constant integer,
+        so b_lower == b_upper == k.
+        Since negative bases are disallowed, pow is
+        monotone in the base and only the two endpoint
+        powers are needed instead of the four of
+        :py:meth:`._pow`
+
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: The constant integer exponent
+        :param b_upper: The constant integer exponent
+        """
+        warning_msg = (
+            "Warning: Power operation "
+            "is an experimental feature. Use with caution."
         )
+        warnings.warn(warning_msg)
+
+        # First, cases that are not allowed
+        if a_lower < 0:
+            raise ArithmeticError(
+                f"Cannot compute interval: pow({(a_lower, a_upper)},{(b_lower, b_upper)})"
+                " because first argument contains negatives"
+            )
+        if 0 in (a_lower, a_upper) and b_lower < 1:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        pow_l = pow(a_lower, b_lower)
+        pow_u = pow(a_upper, b_lower)
+
+        lower = self._protect_nan(min(pow_l, pow_u), "lower")
+
+        upper = self._protect_nan(max(pow_l, pow_u), "upper")
 
         return (lower, upper)
 
-    def _min(self, a, b):
+    def _min(self, a_lower, a_upper, b_lower, b_upper):
         """
         Get the minimum of two confidence intervals
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
-        lower = min(a[0], b[0])
-        upper = min(a[1], b[1])
+        lower = min(a_lower, b_lower)
+        upper = min(a_upper, b_upper)
         return (lower, upper)
 
-    def _max(self, a, b):
+    def _max(self, a_lower, a_upper, b_lower, b_upper):
         """
         Get the maximum of two confidence intervals
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
-        :param b:
-                Confidence interval like: (lower,upper)
-        :type b: tuple
+        :param a_lower: Lower bound of the first interval
+        :param a_upper: Upper bound of the first interval
+        :param b_lower: Lower bound of the second interval
+        :param b_upper: Upper bound of the second interval
         """
-        lower = max(a[0], b[0])
-        upper = max(a[1], b[1])
+        lower = max(a_lower, b_lower)
+        upper = max(a_upper, b_upper)
         return (lower, upper)
 
-    def _abs(self, a):
+    def _abs(self, a_lower, a_upper):
         """
         Absolute value of a confidence interval
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
+        :param a_lower: Lower bound of the interval
+        :param a_upper: Upper bound of the interval
         """
-        abs_a0 = abs(a[0])
-        abs_a1 = abs(a[1])
+        # Plain scalar comparisons: the np.sign ufunc dispatches this
+        # used to make cost more than the rest of the computation.
+        # The interval straddles zero exactly when a_lower <= 0 <= a_upper,
+        # in which case the lower bound is 0
+        abs_a0 = -a_lower if a_lower < 0 else a_lower
+        abs_a1 = -a_upper if a_upper < 0 else a_upper
 
         lower = self._protect_nan(
-            min(abs_a0, abs_a1) if np.sign(a[0]) == np.sign(a[1]) else 0, "lower"
+            0 if a_lower <= 0 <= a_upper else min(abs_a0, abs_a1),
+            "lower",
         )
 
         upper = self._protect_nan(max(abs_a0, abs_a1), "upper")
 
         return (lower, upper)
 
-    def _exp(self, a):
+    def _exp(self, a_lower, a_upper):
         """
         Exponentiate a confidence interval
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
+        :param a_lower: Lower bound of the interval
+        :param a_upper: Upper bound of the interval
         """
 
-        lower = self._protect_nan(np.exp(a[0]), "lower")
+        lower = self._protect_nan(np.exp(a_lower), "lower")
 
-        upper = self._protect_nan(np.exp(a[1]), "upper")
+        upper = self._protect_nan(np.exp(a_upper), "upper")
 
         return (lower, upper)
 
-    def _log(self,a):
+    def _log(self, a_lower, a_upper):
         """
         Take log of a confidence interval
 
-        :param a:
-                Confidence interval like: (lower,upper)
-        :type a: tuple
+        :param a_lower: Lower bound of the interval
+        :param a_upper: Upper bound of the interval
         """
-        lower = self._protect_nan(np.log(a[0]), "lower")
+        lower = self._protect_nan(np.log(a_lower), "lower")
 
-        upper = self._protect_nan(np.log(a[1]), "upper")
+        upper = self._protect_nan(np.log(a_upper), "upper")
 
         return (lower, upper)
 
+    # Operator name -> (interval-arithmetic function, is_binary),
+    # used by propagate(). Defined after the functions so the dict
+    # can reference them directly
+    _BOUND_OP_DISPATCH = {
+        "add": (_add, True),
+        "sub": (_sub, True),
+        "mult": (_mult, True),
+        "div": (_div, True),
+        "pow": (_pow, True),
+        "min": (_min, True),
+        "max": (_max, True),
+        "abs": (_abs, False),
+        "exp": (_exp, False),
+        "log": (_log, False),
+    }
+
     def reset_base_node_dict(self, reset_data=False):
         """
         Reset base node dict to initial obs
@@ -1178,14 +1429,14 @@ class ParseTree(object):
                 than one needs to reset the bounds.
         :type reset_data: bool
         """
-        for node_name in self.base_node_dict:
-            self.base_node_dict[node_name]["bound_computed"] = False
-            self.base_node_dict[node_name]["value_computed"] = False
-            self.base_node_dict[node_name]["value"] = None
-            self.base_node_dict[node_name]["lower"] = float("-inf")
-            self.base_node_dict[node_name]["upper"] = float("inf")
+        for entry in self.base_node_dict.values():
+            entry["bound_computed"] = False
+            entry["value_computed"] = False
+            entry["value"] = None
+            entry["lower"] = float("-inf")
+            entry["upper"] = float("inf")
             if reset_data:
-                self.base_node_dict[node_name]["data_dict"] = None
+                entry["data_dict"] = None
 
         return
 
@@ -1223,48 +1474,20 @@ class ParseTree(object):
                 The graphviz graph object
         :type graph: graphviz.Digraph object
         """
-        if root.left:
-            if root.left.node_type == "base_node":
-                style = "filled"
-                fillcolor = "green"
-            elif root.left.node_type == "constant_node":
-                style = "filled"
-                fillcolor = "yellow"
-            else:
-                style = ""
-                fillcolor = "white"
-
-            graph.node(
-                str(root.left.index),
-                str(root.left.__repr__()),
-                style=style,
-                fillcolor=fillcolor,
-                shape="box",
-                fontsize=f"{self.node_fontsize}",
-            )
-            graph.edge(str(root.index), str(root.left.index))
-            self.make_viz_helper(root.left, graph)
-
-        if root.right:
-            if root.right.node_type == "base_node":
-                style = "filled"
-                fillcolor = "green"
-            elif root.right.node_type == "constant_node":
-                style = "filled"
-                fillcolor = "yellow"
-            else:
-                style = ""
-                fillcolor = "white"
+        for child in (root.left, root.right):
+            if not child:
+                continue
+            style, fillcolor = node_viz_styles.get(child.node_type, ("", "white"))
             graph.node(
-                str(root.right.index),
-                str(root.right.__repr__()),
+                str(child.index),
+                str(child.__repr__()),
                 style=style,
                 fillcolor=fillcolor,
                 shape="box",
                 fontsize=f"{self.node_fontsize}",
             )
-            graph.edge(str(root.index), str(root.right.index))
-            self.make_viz_helper(root.right, graph)
+            graph.edge(str(root.index), str(child.index))
+            self.make_viz_helper(child, graph)
 
 
 def make_parse_trees_from_constraints(
@@ -1293,22 +1516,54 @@ def make_parse_trees_from_constraints(
             across the base nodes.
     :type delta_weight_method: str, defults to "equal"
     """
-    parse_trees = []
-    for ii in range(len(constraint_strs)):
-        constraint_str = constraint_strs[ii]
+    parse_trees = [
+        make_parse_tree(
+            constraint_str=constraint_strs[ii],
+            delta=deltas[ii],
+            regime=regime,
+            sub_regime=sub_regime,
+            columns=columns,
+            delta_weight_method=delta_weight_method,
+        )
+        for ii in range(len(constraint_strs))
+    ]
 
-        delta = deltas[ii]
+    return parse_trees
 
-        # Create parse tree object
-        pt = ParseTree(
-            delta=delta, regime=regime, sub_regime=sub_regime, columns=columns
-        )
 
-        # Fill out tree
-        pt.build_tree(
-            constraint_str=constraint_str, delta_weight_method=delta_weight_method
-        )
+def make_parse_tree(
+    constraint_str,
+    delta,
+    regime="supervised_learning",
+    sub_regime="regression",
+    columns=[],
+    delta_weight_method="equal",
+):
+    """
+    Build a single parse tree from a constraint string and delta.
+    Being a module-level function, it pickles, so callers with many
+    constraints can map it over a process pool
+
+    :param constraint_str: The constraint string
+    :param delta: The confidence level for this constraint
+    :param regime: The category of the machine learning algorithm,
+            e.g., supervised_learning or reinforcement_learning
+    :type regime: str, defaults to "supervised_learning"
+    :param sub_regime: The sub-category of the machine learning algorithm,
+            e.g., classifiction or regression
+    :type sub_regime: str, defults to "regression"
+    :param columns: list of columns in the dataset, needed
+            if constraints condition on any of these columns
+    :param delta_weight_method: The method for weighting deltas
+            across the base nodes.
+    :type delta_weight_method: str, defults to "equal"
+    """
+    # Create parse tree object
+    pt = ParseTree(delta=delta, regime=regime, sub_regime=sub_regime, columns=columns)
 
-        parse_trees.append(pt)
+    # Fill out tree
+    pt.build_tree(
+        constraint_str=constraint_str, delta_weight_method=delta_weight_method
+    )
 
-    return parse_trees
+    return pt
@@ -27,7 +27,12 @@ def load_pickle(filename):
 
 
 def save_pickle(filename, data, verbose=False):
-    """A wrapper for saving an object to a pickle file
+    """A wrapper for saving an object to a pickle file.
+    Uses the highest available pickle protocol, which produces
+    the most compact files and the fastest loads. Spec files can
+    contain arbitrary objects (parse trees, models, custom
+    functions), so pickle is the interchange format rather than a
+    schema-based serializer
 
     :param filename: A filename for the saved pickle file
     :type filename: str
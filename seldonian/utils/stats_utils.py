@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import autograd.numpy as np  # Thinly-wrapped version of Numpy
 from scipy.stats import t
 
@@ -16,6 +18,48 @@ def stddev(v):
     return np.std(v, ddof=1)
 
 
+def mean_and_stddev(v):
+    """
+    Sample mean and standard deviation (with Bessel's correction)
+    of the vector v, sharing the mean between the two statistics.
+    Calling v.mean() and stddev(v) separately makes three passes
+    over the data because np.std recomputes the mean internally;
+    this makes two
+
+    :param v: vector of data
+    :type v: Numpy ndarray
+    :return: (mean, standard deviation with Bessel's correction)
+    :rtype: Tuple(float, float)
+    """
+    n = len(v)
+    mean = np.sum(v) / n
+    residuals = v - mean
+    return mean, np.sqrt(np.dot(residuals, residuals) / (n - 1))
+
+
+def ttest_half_width(sigma, datasize, delta, factor=1):
+    """
+    Shared scalar kernel for the Student-t high-confidence bounds:
+    factor * sigma / sqrt(datasize) * tinv(1 - delta, datasize - 1).
+    All six of the BaseNode ttest bound methods are this expression
+    with a different factor (2 when predicting the safety-test bound
+    from candidate data, 1 on the safety test itself), sign and delta
+
+    :param sigma: Sample standard deviation of the data
+    :type sigma: float
+    :param datasize: The number of observations used for the bound
+    :type datasize: int
+    :param delta: Confidence level, e.g. 0.05
+    :type delta: float
+    :param factor: Multiplier on the confidence interval width
+    :type factor: int, defaults to 1
+    :return: The half-width of the confidence interval
+    :rtype: float
+    """
+    return factor * sigma / np.sqrt(datasize) * tinv(1.0 - delta, datasize - 1)
+
+
+@lru_cache(maxsize=64)
 def tinv(p, nu):
     """
     Returns the inverse of Student's t CDF
@@ -25,6 +69,11 @@ def tinv(p, nu):
     Python implementation of Matlab's tinv function:
     https://www.mathworks.com/help/stats/tinv.html
 
+    Memoized: in candidate selection the bound methods call this
+    with the same (p, nu) pair on every iteration of the optimizer,
+    and scipy's ppf is expensive relative to the rest of the bound
+    computation
+
     :param p: Probability
     :type p: float
     :param nu: Degrees of freedom
@@ -52,6 +101,40 @@ def weighted_sum_gamma(arr, gamma=0.9):
     return np.average(arr, weights=weights) * np.sum(weights)
 
 
+def batch_weighted_sum_gamma(arrs, gamma=0.9):
+    """Calculate the weighted sum of each array in a batch of arrays,
+    where weights are gamma**(index within the array).
+    Equivalent to calling :py:func:`.weighted_sum_gamma` on each
+    array, but zero-pads the (possibly ragged) arrays into a single
+    matrix and performs one matrix-vector product, which is much
+    faster for many short arrays. Used in calculating sums of
+    discounted rewards over many episodes in RL
+
+    :param arrs: A list of input arrays
+    :type arrs: List(Numpy ndarray)
+    :param gamma: The constant used for weighting the arrays,
+        also called the discount factor in RL
+    :type gamma: float
+    :return: The weighted sum of each array
+    :rtype: List(float)
+    """
+    n_arrs = len(arrs)
+    if n_arrs == 0:
+        return []
+    lengths = [len(arr) for arr in arrs]
+    max_length = max(lengths)
+    # If the lengths vary wildly, the zero-padded matrix is mostly
+    # padding and the memory traffic of building it outweighs the
+    # vectorized reduction. Fall back to per-array sums in that case
+    if n_arrs * max_length > 4 * sum(lengths):
+        return [weighted_sum_gamma(arr, gamma) for arr in arrs]
+    padded = np.zeros((n_arrs, max_length))
+    for ii, arr in enumerate(arrs):
+        padded[ii, : lengths[ii]] = arr
+    weights = np.power(gamma, range(max_length))
+    return list(padded @ weights)
+
+
 def softmax(x):
     return np.exp(x) / sum(np.exp(x))
 
@@ -245,6 +245,32 @@ def test_divide_bounds(interval_index,stump):
 	assert pt.base_node_dict['a']['bound_computed'] == True
 	assert pt.base_node_dict['b']['bound_computed'] == True
 
+def test_multiply_zero_and_infinite_endpoint_bounds(stump):
+	### Multiplication where a zero endpoint meets an infinite one ###
+	# The 0 * inf endpoint product is NaN, which the four-product
+	# reduction maps to the conservative (-inf, inf). The
+	# sign-classed fast paths must not tighten these cases
+	a,b=[float('-inf'),-8.52],[0.0,1.52]
+	pt = stump('mult',a,b)
+	pt.propagate_bounds()
+	assert pt.root.lower == float('-inf')
+	assert pt.root.upper == float('inf')
+
+	a,b=[0.0,3.01],[float('-inf'),-0.82]
+	pt = stump('mult',a,b)
+	pt.propagate_bounds()
+	assert pt.root.lower == float('-inf')
+	assert pt.root.upper == float('inf')
+
+def test_divide_zero_and_infinite_endpoint_bounds(stump):
+	### Division reaching the 0 * inf case through its ###
+	### reduction to multiplication by the reciprocal ###
+	a,b=[0.0,3.01],[-0.82,0.0]
+	pt = stump('div',a,b)
+	pt.propagate_bounds()
+	assert pt.root.lower == float('-inf')
+	assert pt.root.upper == float('inf')
+
 @pytest.mark.parametrize('interval_index',range(len(two_interval_options)))
 def test_power_bounds(interval_index,stump):
 	### power ###
@@ -282,6 +308,68 @@ def test_power_bounds(interval_index,stump):
 		assert pt.base_node_dict['a']['bound_computed'] == True
 		assert pt.base_node_dict['b']['bound_computed'] == True
 
+def test_power_bounds_constant_integer_exponent():
+	### power with a constant integer exponent, which the ###
+	### compiled propagation program routes through the ###
+	### specialized two-power kernel instead of _pow ###
+
+	# A warning message should be raised
+	# anytime the power operator is called
+	warning_msg = ("Warning: Power operation "
+		"is an experimental feature. Use with caution.")
+	delta = 0.05
+
+	def make_tree(constraint_str,lower,upper):
+		pt = ParseTree(delta,regime='supervised_learning',
+			sub_regime='classification')
+		pt.create_from_ast(constraint_str)
+		pt.assign_deltas(weight_method='equal')
+		entry = pt.base_node_dict['FPR']
+		entry['bound_computed'] = True
+		entry['lower'] = lower
+		entry['upper'] = upper
+		return pt
+
+	# The compiled program dispatches to the specialized kernel
+	# for integer exponents, but not for fractional ones
+	pt = make_tree('FPR ** 2',0.5,0.75)
+	assert ParseTree._pow_intk in [instr[2] for instr in pt._propagation_program]
+	pt_frac = make_tree('FPR ** 0.5',0.5,0.75)
+	assert ParseTree._pow_intk not in [
+		instr[2] for instr in pt_frac._propagation_program]
+
+	# k > 0
+	with pytest.warns(UserWarning,match=warning_msg):
+		pt.propagate_bounds()
+	answer = pt._pow(0.5,0.75,2,2)
+	assert pt.root.lower == pytest.approx(answer[0])
+	assert pt.root.upper == pytest.approx(answer[1])
+
+	# k < 0
+	pt = make_tree('FPR ** (-2)',0.5,2.0)
+	with pytest.warns(UserWarning,match=warning_msg):
+		pt.propagate_bounds()
+	answer = pt._pow(0.5,2.0,-2,-2)
+	assert pt.root.lower == pytest.approx(answer[0])
+	assert pt.root.upper == pytest.approx(answer[1])
+
+	# k = 0
+	pt = make_tree('FPR ** 0',0.5,2.0)
+	with pytest.warns(UserWarning,match=warning_msg):
+		pt.propagate_bounds()
+	answer = pt._pow(0.5,2.0,0,0)
+	assert pt.root.lower == pytest.approx(answer[0])
+	assert pt.root.upper == pytest.approx(answer[1])
+
+	# A base interval touching zero cannot be raised
+	# to a power less than 1
+	for constraint_str in ['FPR ** (-2)','FPR ** 0']:
+		pt = make_tree(constraint_str,0.0,0.5)
+		with pytest.warns(UserWarning,match=warning_msg):
+			with pytest.raises(ZeroDivisionError) as excinfo:
+				pt.propagate_bounds()
+		assert "0.0 cannot be raised to a negative power" in str(excinfo.value)
+
 @pytest.mark.parametrize('interval_index',range(len(two_interval_options)))
 def test_min_bounds(interval_index,stump):
 	### min ###
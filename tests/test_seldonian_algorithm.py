@@ -596,6 +596,184 @@ def test_gpa_data_regression_custom_constraint(gpa_regression_dataset):
 
 	assert np.allclose(solution,array_to_compare)
 
+def test_gpa_data_regression_amsgrad(gpa_regression_dataset):
+	""" Test that the gpa regression example runs and
+	passes the safety test with the AMSGrad variant of
+	the adam optimizer turned on. Start from the zeros
+	initial solution so the optimizer has to move and the
+	variant's update rule actually determines the solution.
+	"""
+	rseed=0
+	np.random.seed(rseed)
+	constraint_strs = ['Mean_Squared_Error - 5.0']
+	deltas = [0.05]
+
+	(dataset,model,
+		primary_objective,parse_trees) = gpa_regression_dataset(
+		constraint_strs=constraint_strs,
+		deltas=deltas)
+
+	frac_data_in_safety=0.6
+
+	# Create spec object
+	spec = SupervisedSpec(
+		dataset=dataset,
+		model=model,
+		parse_trees=parse_trees,
+		sub_regime='regression',
+		frac_data_in_safety=frac_data_in_safety,
+		primary_objective=primary_objective,
+		use_builtin_primary_gradient_fn=True,
+		initial_solution_fn=None,
+		optimization_technique='gradient_descent',
+		optimizer='adam',
+		optimization_hyperparams={
+			'lambda_init'   : np.array([0.5]),
+			'alpha_theta'   : 0.005,
+			'alpha_lamb'    : 0.005,
+			'beta_velocity' : 0.9,
+			'beta_rmsprop'  : 0.95,
+			'num_iters'     : 200,
+			'use_batches'   : False,
+			'gradient_library': "autograd",
+			'hyper_search'  : None,
+			'verbose'       : True,
+			'amsgrad'       : True,
+		}
+	)
+
+	# Run seldonian algorithm
+	SA = SeldonianAlgorithm(spec)
+	passed_safety,solution = SA.run()
+	assert passed_safety == True
+	array_to_compare = np.array(
+		[0.00085514, 0.00070994, 0.00078139, 0.00080743, 0.00082167,
+		 0.00078116, 0.00087951, 0.00085207, 0.00070303, 0.0007309 ]
+	)
+	assert np.allclose(solution,array_to_compare)
+
+def test_gpa_data_regression_nadam(gpa_regression_dataset):
+	""" Test that the gpa regression example runs and
+	passes the safety test with the nadam optimizer,
+	and that optimizer='nadam' is accepted through
+	CandidateSelection.run(). Start from the zeros
+	initial solution so the optimizer has to move and the
+	Nadam lookahead actually determines the solution.
+	"""
+	rseed=0
+	np.random.seed(rseed)
+	constraint_strs = ['Mean_Squared_Error - 5.0']
+	deltas = [0.05]
+
+	(dataset,model,
+		primary_objective,parse_trees) = gpa_regression_dataset(
+		constraint_strs=constraint_strs,
+		deltas=deltas)
+
+	frac_data_in_safety=0.6
+
+	# Create spec object
+	spec = SupervisedSpec(
+		dataset=dataset,
+		model=model,
+		parse_trees=parse_trees,
+		sub_regime='regression',
+		frac_data_in_safety=frac_data_in_safety,
+		primary_objective=primary_objective,
+		use_builtin_primary_gradient_fn=True,
+		initial_solution_fn=None,
+		optimization_technique='gradient_descent',
+		optimizer='nadam',
+		optimization_hyperparams={
+			'lambda_init'   : np.array([0.5]),
+			'alpha_theta'   : 0.005,
+			'alpha_lamb'    : 0.005,
+			'beta_velocity' : 0.9,
+			'beta_rmsprop'  : 0.95,
+			'num_iters'     : 200,
+			'use_batches'   : False,
+			'gradient_library': "autograd",
+			'hyper_search'  : None,
+			'verbose'       : True,
+		}
+	)
+
+	# Run seldonian algorithm
+	SA = SeldonianAlgorithm(spec)
+	passed_safety,solution = SA.run()
+	assert passed_safety == True
+	array_to_compare = np.array(
+		[0.00068556, 0.00035015, 0.00053527, 0.00059208, 0.0006232 ,
+		 0.00052078, 0.00078753, 0.0007096 , 0.0003274 , 0.00040705]
+	)
+	assert np.allclose(solution,array_to_compare)
+
+def test_gpa_data_regression_float32_precision(gpa_regression_dataset):
+	""" Test that passing 'precision': 'float32' in
+	optimization_hyperparams casts the candidate data and initial
+	solution to single precision inside candidate selection, and
+	that the algorithm still finds a passing solution.
+	"""
+	rseed=0
+	np.random.seed(rseed)
+	constraint_strs = ['Mean_Squared_Error - 5.0']
+	deltas = [0.05]
+
+	(dataset,model,
+		primary_objective,parse_trees) = gpa_regression_dataset(
+		constraint_strs=constraint_strs,
+		deltas=deltas)
+
+	frac_data_in_safety=0.6
+
+	# Create spec object
+	spec = SupervisedSpec(
+		dataset=dataset,
+		model=model,
+		parse_trees=parse_trees,
+		sub_regime='regression',
+		frac_data_in_safety=frac_data_in_safety,
+		primary_objective=primary_objective,
+		use_builtin_primary_gradient_fn=True,
+		initial_solution_fn=model.fit,
+		optimization_technique='gradient_descent',
+		optimizer='adam',
+		optimization_hyperparams={
+			'lambda_init'   : np.array([0.5]),
+			'alpha_theta'   : 0.005,
+			'alpha_lamb'    : 0.005,
+			'beta_velocity' : 0.9,
+			'beta_rmsprop'  : 0.95,
+			'num_iters'     : 200,
+			'use_batches'   : False,
+			'gradient_library': "autograd",
+			'hyper_search'  : None,
+			'verbose'       : True,
+			'precision'     : 'float32',
+		}
+	)
+
+	# Check that the flag actually reaches candidate selection
+	# through the documented route (optimization_hyperparams -> run())
+	SA = SeldonianAlgorithm(spec)
+	SA.set_initial_solution()
+	cs = SA.candidate_selection()
+	candidate_solution = cs.run(
+		**spec.optimization_hyperparams,
+		use_builtin_primary_gradient_fn=spec.use_builtin_primary_gradient_fn,
+		custom_primary_gradient_fn=spec.custom_primary_gradient_fn,
+		debug=False)
+	assert cs.features.dtype == np.float32
+	assert cs.labels.dtype == np.float32
+	assert cs.initial_solution.dtype == np.float32
+	assert not (type(candidate_solution) == str and candidate_solution == 'NSF')
+
+	# Run the full seldonian algorithm with the same spec
+	np.random.seed(rseed)
+	SA = SeldonianAlgorithm(spec)
+	passed_safety,solution = SA.run()
+	assert passed_safety == True
+
 def test_gpa_data_classification(gpa_classification_dataset):
 	""" Test that the gpa classification example runs 
 	with the five fairness constraints (separately):
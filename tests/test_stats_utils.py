@@ -2,7 +2,7 @@ import pytest
 import autograd.numpy as np
 
 from seldonian.utils.stats_utils import (stddev,
-	tinv,weighted_sum_gamma)
+	tinv,weighted_sum_gamma,batch_weighted_sum_gamma)
 
 ### Begin tests
 
@@ -48,4 +48,29 @@ def test_weighted_sum_gamma():
 	assert weighted_sum_gamma(arr,gamma=0.9) == float('inf')
 
 	arr=[float('-inf'),float('inf')]
-	assert np.isnan(weighted_sum_gamma(arr,gamma=0.9))
\ No newline at end of file
+	assert np.isnan(weighted_sum_gamma(arr,gamma=0.9))
+
+def test_batch_weighted_sum_gamma():
+	""" Test that the batched weighted sum agrees elementwise
+	with weighted_sum_gamma on each array, on both sides of the
+	padded-matrix vs. ragged-fallback threshold """
+
+	assert batch_weighted_sum_gamma([],gamma=0.9) == []
+
+	# Similar lengths: n_arrs * max_length <= 4 * sum(lengths),
+	# so the padded matrix-vector product path is taken
+	arrs = [np.array([1.0]),np.array([1,2,3]),np.arange(4.0)]
+	assert 3*3 <= 4*(1+3+4)
+	results = batch_weighted_sum_gamma(arrs,gamma=0.9)
+	assert len(results) == 3
+	for result,arr in zip(results,arrs):
+		assert result == pytest.approx(weighted_sum_gamma(arr,gamma=0.9))
+
+	# Wildly varying lengths: n_arrs * max_length > 4 * sum(lengths),
+	# so the per-array fallback is taken
+	arrs = [np.array([float(ii)]) for ii in range(10)] + [np.arange(1000)]
+	assert 11*1000 > 4*(10+1000)
+	results = batch_weighted_sum_gamma(arrs,gamma=0.9)
+	assert len(results) == 11
+	for result,arr in zip(results,arrs):
+		assert result == pytest.approx(weighted_sum_gamma(arr,gamma=0.9))
\ No newline at end of file